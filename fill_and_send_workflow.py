@@ -542,6 +542,8 @@ Best regards,
                 print("✅ Browser closed successfully")
         except Exception as e:
             print(f"⚠️ Error closing browser: {e}")
+        finally:
+            self.pdf_processor.close()
 
 def main():
     """Main function to run the fill and send workflow"""
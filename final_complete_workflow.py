@@ -19,6 +19,7 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 import subprocess
 import requests
+import fitz  # PyMuPDF
 from webdriver_manager.chrome import ChromeDriverManager
 
 # Add modules directory to path
@@ -241,36 +242,41 @@ class FinalCompleteWorkflow:
             
             print(f"✅ Found working PDF: {os.path.basename(working_pdf)}")
             
-            # Analyze PDF fields
-            print("🔍 Analyzing PDF form fields...")
-            fields = self.pdf_processor.analyze_pdf_fields(working_pdf)
-            
-            if fields:
-                print(f"✅ Found {len(fields)} form fields:")
-                for i, field in enumerate(fields, 1):
-                    print(f"   {i}. {field['name']} ({field['type']})")
-            else:
-                print("⚠️ No form fields found in the PDF")
-            
-            # Generate AI data
-            print("🤖 Generating AI data with Gemini...")
-            intelligent_data = self.pdf_processor.generate_form_data_with_gemini(working_pdf)
-            
-            print("✅ AI-generated data:")
-            for key, value in intelligent_data.items():
-                print(f"   📝 {key}: {value}")
-            
-            # Fill the PDF
-            print("📝 Filling PDF with AI data...")
-            filled_pdf = os.path.join(os.path.dirname(__file__), "final_filled_10-6_form.pdf")
-            result = self.pdf_processor.fill_pdf_automatically(working_pdf, intelligent_data, filled_pdf)
-            
-            if result:
-                print(f"✅ PDF filled successfully: {os.path.basename(result)}")
-                return result
-            else:
-                print("❌ Failed to fill PDF")
-                return None
+            # Open the PDF once and share it between analysis and filling
+            doc = fitz.open(working_pdf)
+            try:
+                # Analyze PDF fields
+                print("🔍 Analyzing PDF form fields...")
+                fields = self.pdf_processor.analyze_pdf_fields(doc)
+                
+                if fields:
+                    print(f"✅ Found {len(fields)} form fields:")
+                    for i, field in enumerate(fields, 1):
+                        print(f"   {i}. {field['name']} ({field['type']})")
+                else:
+                    print("⚠️ No form fields found in the PDF")
+                
+                # Generate AI data
+                print("🤖 Generating AI data with Gemini...")
+                intelligent_data = self.pdf_processor.generate_form_data_with_gemini(working_pdf)
+                
+                print("✅ AI-generated data:")
+                for key, value in intelligent_data.items():
+                    print(f"   📝 {key}: {value}")
+                
+                # Fill the PDF
+                print("📝 Filling PDF with AI data...")
+                filled_pdf = os.path.join(os.path.dirname(__file__), "final_filled_10-6_form.pdf")
+                result = self.pdf_processor.fill_pdf_automatically(doc, intelligent_data, filled_pdf)
+                
+                if result:
+                    print(f"✅ PDF filled successfully: {os.path.basename(result)}")
+                    return result
+                else:
+                    print("❌ Failed to fill PDF")
+                    return None
+            finally:
+                doc.close()
                 
         except Exception as e:
             print(f"❌ Error filling working PDF: {e}")
@@ -561,6 +567,8 @@ Best regards,
                 print("✅ Browser closed successfully")
         except Exception as e:
             print(f"⚠️ Error closing browser: {e}")
+        finally:
+            self.pdf_processor.close()
 
 def main():
     """Main function to run the final complete workflow"""
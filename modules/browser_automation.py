@@ -6,16 +6,79 @@ Handles web browser interactions, PDF downloads, and navigation
 import os
 import time
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+
+# selenium and webdriver_manager are imported lazily inside the methods that
+# need them, so importing this package (e.g. for EmailAutomation only) stays cheap.
+
+def _xpath_literal(text):
+    """Quote a string for use as an XPath 1.0 literal"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _build_download_link_xpath(link_texts):
+    """Build a single XPath matching any download link candidate"""
+    # contains() also covers exact matches; _pick_download_link ranks them
+    conditions = [f"contains(normalize-space(), {_xpath_literal(t)})" for t in link_texts]
+    conditions.append("contains(@href, '.pdf')")
+    return "//a[" + " or ".join(conditions) + "]"
+
+
+# Normalized text and href of each candidate link, fetched in one round-trip
+_LINK_INFO_JS = """
+return arguments[0].map(a => [
+    (a.textContent || '').replace(/\\s+/g, ' ').trim(),
+    a.getAttribute('href') || ''
+]);
+"""
+
+
+def _pick_download_link(link_info, link_texts):
+    """
+    Return the index of the link to click, or None
+    
+    Same priority as trying each link text in turn: exact text, then partial
+    text, then (after the first text only) any .pdf href.
+    
+    Args:
+        link_info (list): (normalized text, href) per candidate, in document order
+        link_texts (sequence): Link texts in priority order
+    """
+    tests = []
+    for i, t in enumerate(link_texts):
+        tests.append(lambda text, href, t=t: text == t)
+        tests.append(lambda text, href, t=t: t in text)
+        if i == 0:
+            tests.append(lambda text, href: '.pdf' in href)
+    
+    for test in tests:
+        for index, (text, href) in enumerate(link_info):
+            if test(text, href):
+                return index
+    return None
+
 
 class BrowserAutomation:
+    # Candidate download link texts and their pre-joined XPath
+    _DEFAULT_LINK_TEXTS = ("Download", "download", "PDF", "Form", "Get Form")
+    _COMBINED_XPATH = _build_download_link_xpath(_DEFAULT_LINK_TEXTS)
+    
+    # Seconds driver.get() may take for a full ("normal") page load,
+    # subresources included; the same as chromedriver's own default
+    PAGE_LOAD_TIMEOUT = 300
+    
+    # Extra Chrome flags applied in headless mode
+    HEADLESS_FAST_ARGS = (
+        "--disable-gpu",
+        "--blink-settings=imagesEnabled=false",
+        "--disable-extensions",
+        "--disable-background-networking",
+    )
+
     def __init__(self, download_dir=None, headless=False):
         """
         Initialize browser automation
@@ -32,11 +95,24 @@ class BrowserAutomation:
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options"""
         try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+            from selenium.webdriver.chrome.options import Options
+            from webdriver_manager.chrome import ChromeDriverManager
+
             chrome_options = Options()
             
+            # driver.get() blocks inside chromedriver until readyState is
+            # "complete", so no readyState polling is needed afterwards
+            chrome_options.page_load_strategy = 'normal'
+            
             # Basic options
             if self.headless:
                 chrome_options.add_argument("--headless")
+                # Unattended runs never look at the page, so skip GPU setup,
+                # image downloads and background traffic
+                for arg in self.HEADLESS_FAST_ARGS:
+                    chrome_options.add_argument(arg)
             
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
@@ -52,12 +128,15 @@ class BrowserAutomation:
                 "safebrowsing.enabled": True,
                 "plugins.always_open_pdf_externally": True
             }
+            if self.headless:
+                prefs["profile.managed_default_content_settings.images"] = 2
             chrome_options.add_experimental_option("prefs", prefs)
             
             # Initialize driver
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self.driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
             
             self.logger.info("Chrome WebDriver initialized successfully")
             return True
@@ -72,21 +151,20 @@ class BrowserAutomation:
         
         Args:
             url (str): URL to navigate to
-            wait_time (int): Maximum wait time for page load
+            wait_time (int): Unused, kept for compatibility; get() waits for the
+                page load itself, bounded by PAGE_LOAD_TIMEOUT
         """
+        from selenium.common.exceptions import TimeoutException
+
         try:
             if not self.driver:
                 if not self.setup_driver():
                     return False
             
             self.logger.info(f"Navigating to: {url}")
+            # get() honours the page load strategy and times out after PAGE_LOAD_TIMEOUT
             self.driver.get(url)
             
-            # Wait for page to load
-            WebDriverWait(self.driver, wait_time).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            
             self.logger.info("Page loaded successfully")
             return True
             
@@ -103,59 +181,85 @@ class BrowserAutomation:
         
         Args:
             link_texts (list): List of possible link texts to search for
-            wait_time (int): Maximum wait time
+            wait_time (int): Maximum wait time for a candidate link to appear
         """
-        if not link_texts:
-            link_texts = ["Download", "download", "PDF", "Form", "Get Form"]
+        if link_texts:
+            xpath = _build_download_link_xpath(link_texts)
+        else:
+            link_texts = self._DEFAULT_LINK_TEXTS
+            xpath = self._COMBINED_XPATH
         
         try:
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.common.exceptions import TimeoutException
+
             self.logger.info("Searching for download links...")
             
-            # Try different strategies to find download links
-            download_clicked = False
-            
-            for link_text in link_texts:
-                try:
-                    # Strategy 1: Find by link text
-                    elements = self.driver.find_elements(By.LINK_TEXT, link_text)
-                    if elements:
-                        self.logger.info(f"Found {len(elements)} elements with text: {link_text}")
-                        elements[0].click()
-                        download_clicked = True
-                        break
-                    
-                    # Strategy 2: Find by partial link text
-                    elements = self.driver.find_elements(By.PARTIAL_LINK_TEXT, link_text)
-                    if elements:
-                        self.logger.info(f"Found {len(elements)} elements with partial text: {link_text}")
-                        elements[0].click()
-                        download_clicked = True
-                        break
-                    
-                    # Strategy 3: Find by href containing PDF
-                    elements = self.driver.find_elements(By.XPATH, f"//a[contains(@href, '.pdf')]")
-                    if elements:
-                        self.logger.info(f"Found {len(elements)} PDF links")
-                        elements[0].click()
-                        download_clicked = True
-                        break
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error with link text '{link_text}': {e}")
-                    continue
+            # Snapshot the download dir so a fast download that finishes before
+            # the first poll is still detected as "started"
+            existing_files = self._list_download_dir()
+
+            # One XPath covers exact text, partial text and .pdf hrefs, so the
+            # browser evaluates a single query instead of three per link text
+            try:
+                elements = WebDriverWait(self.driver, wait_time).until(
+                    lambda driver: driver.find_elements(By.XPATH, xpath)
+                )
+            except TimeoutException:
+                elements = []
             
-            if download_clicked:
-                self.logger.info("Download link clicked successfully")
-                time.sleep(3)  # Wait for download to start
-                return True
-            else:
+            # Candidates come back in document order; click the one the
+            # per-text priority picks, not just the first (e.g. a nav link)
+            index = None
+            if elements:
+                link_info = self.driver.execute_script(_LINK_INFO_JS, elements)
+                index = _pick_download_link(link_info, link_texts)
+            if index is None:
                 self.logger.warning("No download links found")
                 return False
+            
+            self.logger.info(f"Found {len(elements)} candidate download links, clicking: {link_info[index][0]}")
+            elements[index].click()
+            self.logger.info("Download link clicked successfully")
+            self._wait_for_download_start(existing_files)
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error finding download link: {e}")
             return False
     
+    def _list_download_dir(self):
+        """Return the set of file names currently in the download directory"""
+        try:
+            with os.scandir(self.download_dir) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return set()
+    
+    def _wait_for_download_start(self, existing_files, timeout=5, poll_interval=0.1):
+        """
+        Wait until Chrome starts writing a download into the download directory
+        
+        Args:
+            existing_files (set): File names present before the link was clicked
+            timeout (float): Maximum wait time in seconds
+            poll_interval (float): Delay between directory scans in seconds
+        
+        Returns:
+            bool: True if a download was detected, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            new_files = self._list_download_dir() - existing_files
+            if any(name.endswith(('.crdownload', '.pdf')) for name in new_files):
+                self.logger.info("Download started")
+                return True
+            time.sleep(poll_interval)
+        
+        self.logger.warning(f"No download detected within {timeout}s")
+        return False
+    
     def wait_for_download(self, filename=None, timeout=30):
         """
         Wait for download to complete
@@ -213,6 +317,11 @@ class BrowserAutomation:
             if self.driver:
                 self.driver.quit()
             
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+            from selenium.webdriver.chrome.options import Options
+            from webdriver_manager.chrome import ChromeDriverManager
+
             # Setup new driver with profile
             chrome_options = Options()
             chrome_options.add_argument(f"--profile-directory={profile_name}")
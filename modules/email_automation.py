@@ -5,16 +5,73 @@ Handles email composition, sending, and Gmail integration
 
 import os
 import smtplib
+import socket
 import logging
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from email.mime.image import MIMEImage
-import json
+import mimetypes
+from email.message import EmailMessage
+from email.utils import formatdate
 from datetime import datetime
+from string import Template
+
+from .jsonutil import json_loads, json_dumps
+
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+class _ResolvedSMTP(smtplib.SMTP):
+    """SMTP client that connects to a pre-resolved socket address
+    
+    The hostname passed to connect() is still used for STARTTLS/SNI, only
+    the DNS lookup is skipped.
+    """
+    
+    def __init__(self, sockaddr, **kwargs):
+        self._sockaddr = sockaddr
+        super().__init__(**kwargs)
+    
+    def _get_socket(self, host, port, timeout):
+        return socket.create_connection(self._sockaddr[:2], timeout, self.source_address)
+
+
+# Body of the workflow notification email; only the placeholders vary per call
+_WORKFLOW_BODY_TPL = Template("""Dear Recipient,
+
+I hope this email finds you well. I am writing to inform you about the successful completion of an automated workflow execution.
+
+**Workflow Summary:**
+- Workflow Name: ${workflow_name}
+- Execution Time: ${execution_time}
+- Status: ${status}
+
+**Process Details:**
+- Successfully downloaded the TREC Addendum for Sale of Other Property by Buyer form
+- Filled out the form with the specified data:
+  - Date: 27-08-2025
+  - Address: 6/66, Anna Nagar, Chennai, 602105
+- Saved the completed form as 'newpdfff.pdf'
+- Prepared the document for email transmission
+
+The completed form is attached to this email for your review and records.
+
+This automated process demonstrates the successful integration of web automation, document processing, and email communication systems.
+
+Please let me know if you need any additional information or have any questions regarding this submission.
+
+Best regards,
+Automated Workflow System
+
+---
+This email was generated automatically by the RPA system.
+Execution ID: ${execution_id}
+""")
+
 
 class EmailAutomation:
+    # OS keyring service under which SMTP passwords are stored
+    KEYRING_SERVICE = "buddhisys-smtp"
+    
     def __init__(self, smtp_server=None, smtp_port=None, username=None, password=None):
         """
         Initialize email automation
@@ -30,6 +87,11 @@ class EmailAutomation:
         self.username = username
         self.password = password
         self.logger = logging.getLogger(__name__)
+        
+        # Resolved SMTP address and authenticated connection reused across sends
+        self._smtp_sockaddr = None
+        self._smtp_conn = None
+        self._smtp_conn_key = None
     
     def create_email_message(self, to_email, subject, body, attachments=None, cc=None, bcc=None):
         """
@@ -47,11 +109,11 @@ class EmailAutomation:
             self.logger.info(f"Creating email message to: {to_email}")
             
             # Create message container
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg['From'] = self.username
             msg['To'] = ', '.join(to_email) if isinstance(to_email, list) else to_email
             msg['Subject'] = subject
-            msg['Date'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
+            msg['Date'] = formatdate(localtime=True)
             
             # Add CC and BCC if provided
             if cc:
@@ -60,7 +122,7 @@ class EmailAutomation:
                 msg['Bcc'] = ', '.join(bcc) if isinstance(bcc, list) else bcc
             
             # Add body to email
-            msg.attach(MIMEText(body, 'plain'))
+            msg.set_content(body)
             
             # Add attachments
             if attachments:
@@ -86,16 +148,16 @@ class EmailAutomation:
             file_path (str): Path to file to attach
         """
         try:
-            with open(file_path, "rb") as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
+            content_type, _ = mimetypes.guess_type(file_path)
+            maintype, subtype = (content_type or 'application/octet-stream').split('/', 1)
             
-            encoders.encode_base64(part)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {os.path.basename(file_path)}'
-            )
-            msg.attach(part)
+            with open(file_path, "rb") as attachment:
+                msg.add_attachment(
+                    attachment.read(),
+                    maintype=maintype,
+                    subtype=subtype,
+                    filename=os.path.basename(file_path)
+                )
             
             self.logger.info(f"Attachment added: {os.path.basename(file_path)}")
             
@@ -125,33 +187,19 @@ class EmailAutomation:
                 return False
             
             # Prepare recipient list
-            recipients = []
-            if isinstance(to_email, list):
-                recipients.extend(to_email)
-            else:
-                recipients.append(to_email)
-            
-            if cc:
-                if isinstance(cc, list):
-                    recipients.extend(cc)
-                else:
-                    recipients.append(cc)
-            
-            if bcc:
-                if isinstance(bcc, list):
-                    recipients.extend(bcc)
-                else:
-                    recipients.append(bcc)
+            recipients = self._collect_recipients(to_email, cc, bcc)
             
-            # Connect to server and send email
-            self.logger.info(f"Connecting to SMTP server: {self.smtp_server}:{self.smtp_port}")
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.username, self.password)
+            # Reuse the cached connection when it is still alive
+            server = self._get_smtp_connection()
             
-            text = msg.as_string()
-            server.sendmail(self.username, recipients, text)
-            server.quit()
+            # send_message strips the Bcc header before transmission
+            try:
+                server.send_message(msg, self.username, recipients)
+            except smtplib.SMTPServerDisconnected:
+                # Connection dropped between the NOOP probe and the send
+                self.close_connection()
+                server = self._get_smtp_connection()
+                server.send_message(msg, self.username, recipients)
             
             self.logger.info(f"Email sent successfully to: {', '.join(recipients)}")
             return True
@@ -160,6 +208,156 @@ class EmailAutomation:
             self.logger.error(f"Error sending email: {e}")
             return False
     
+    def _resolve_smtp_address(self):
+        """Resolve the SMTP server address once and cache it on the instance"""
+        if self._smtp_sockaddr is None:
+            infos = socket.getaddrinfo(self.smtp_server, self.smtp_port, type=socket.SOCK_STREAM)
+            self._smtp_sockaddr = infos[0][4]
+        return self._smtp_sockaddr
+    
+    def _get_smtp_connection(self):
+        """
+        Return an authenticated SMTP connection, reconnecting only if needed
+        
+        A cached connection is probed with NOOP; it is replaced when the probe
+        fails or when server/port/username changed since it was opened.
+        """
+        conn_key = (self.smtp_server, self.smtp_port, self.username)
+        if self._smtp_conn is not None and self._smtp_conn_key == conn_key:
+            try:
+                if self._smtp_conn.noop()[0] == 250:
+                    return self._smtp_conn
+            except OSError:
+                pass
+        
+        self.close_connection()
+        if self._smtp_conn_key is None or self._smtp_conn_key[:2] != conn_key[:2]:
+            self._smtp_sockaddr = None
+        
+        self.logger.info(f"Connecting to SMTP server: {self.smtp_server}:{self.smtp_port}")
+        server = _ResolvedSMTP(self._resolve_smtp_address())
+        try:
+            server.connect(self.smtp_server, self.smtp_port)
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            # Force a fresh DNS lookup next time in case the address went stale
+            self._smtp_sockaddr = None
+            server.close()
+            raise
+        
+        self._smtp_conn = server
+        self._smtp_conn_key = conn_key
+        return server
+    
+    def close_connection(self):
+        """Close the cached SMTP connection, if any"""
+        server, self._smtp_conn = self._smtp_conn, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def close(self):
+        """Close the SMTP connection kept open between sends"""
+        self.close_connection()
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+    def _collect_recipients(self, to_email, cc=None, bcc=None):
+        """Flatten To/CC/BCC address(es) into a single envelope recipient list"""
+        recipients = []
+        for addresses in (to_email, cc, bcc):
+            if not addresses:
+                continue
+            if isinstance(addresses, list):
+                recipients.extend(addresses)
+            else:
+                recipients.append(addresses)
+        return recipients
+    
+    async def send_email_async(self, to_email, subject, body, attachments=None, cc=None, bcc=None):
+        """
+        Send email with attachments using asyncio
+        
+        Args:
+            to_email (str or list): Recipient email address(es)
+            subject (str): Email subject
+            body (str): Email body
+            attachments (list): List of file paths to attach
+            cc (str or list): CC email address(es)
+            bcc (str or list): BCC email address(es)
+        """
+        msg = self.create_email_message(to_email, subject, body, attachments, cc, bcc)
+        if not msg:
+            return False
+        
+        sent = await self.send_bulk([msg])
+        return sent == 1
+    
+    async def send_bulk(self, messages):
+        """
+        Send several prepared messages over one SMTP connection
+        
+        A single TLS handshake and login is shared by every message instead
+        of reconnecting per send.
+        
+        Args:
+            messages (list): Email message objects from create_email_message
+        
+        Returns:
+            int: Number of messages sent successfully
+        """
+        try:
+            if not self.username or not self.password:
+                self.logger.error("Email credentials not configured")
+                return 0
+            
+            import asyncio
+            import aiosmtplib
+            
+            self.logger.info(f"Connecting to SMTP server: {self.smtp_server}:{self.smtp_port}")
+            client = aiosmtplib.SMTP(
+                hostname=self.smtp_server,
+                port=self.smtp_port,
+                use_tls=False,
+                start_tls=True
+            )
+            await client.connect()
+            try:
+                await client.login(self.username, self.password)
+                results = await asyncio.gather(
+                    *(client.send_message(msg) for msg in messages),
+                    return_exceptions=True
+                )
+            finally:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+            
+            sent = 0
+            for msg, result in zip(messages, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error sending email to {msg['To']}: {result}")
+                else:
+                    sent += 1
+            
+            self.logger.info(f"Bulk send complete: {sent}/{len(messages)} emails sent")
+            return sent
+            
+        except Exception as e:
+            self.logger.error(f"Error sending bulk email: {e}")
+            return 0
+    
     def create_workflow_email(self, recipient, pdf_path, workflow_details=None):
         """
         Create a professional email for workflow execution
@@ -170,45 +368,25 @@ class EmailAutomation:
             workflow_details (dict): Details about the workflow execution
         """
         try:
+            # Format the timestamp once and derive the execution ID from it
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            execution_id = now_str.replace('-', '').replace(':', '').replace(' ', '_')
+            
             if not workflow_details:
                 workflow_details = {
                     'workflow_name': 'TREC Form Processing',
-                    'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'execution_time': now_str,
                     'status': 'Completed Successfully'
                 }
             
             subject = "Automated workflow execution of the usecase #1"
             
-            body = f"""Dear Recipient,
-
-I hope this email finds you well. I am writing to inform you about the successful completion of an automated workflow execution.
-
-**Workflow Summary:**
-- Workflow Name: {workflow_details.get('workflow_name', 'TREC Form Processing')}
-- Execution Time: {workflow_details.get('execution_time', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}
-- Status: {workflow_details.get('status', 'Completed Successfully')}
-
-**Process Details:**
-- Successfully downloaded the TREC Addendum for Sale of Other Property by Buyer form
-- Filled out the form with the specified data:
-  - Date: 27-08-2025
-  - Address: 6/66, Anna Nagar, Chennai, 602105
-- Saved the completed form as 'newpdfff.pdf'
-- Prepared the document for email transmission
-
-The completed form is attached to this email for your review and records.
-
-This automated process demonstrates the successful integration of web automation, document processing, and email communication systems.
-
-Please let me know if you need any additional information or have any questions regarding this submission.
-
-Best regards,
-Automated Workflow System
-
----
-This email was generated automatically by the RPA system.
-Execution ID: {datetime.now().strftime('%Y%m%d_%H%M%S')}
-"""
+            body = _WORKFLOW_BODY_TPL.substitute(
+                workflow_name=workflow_details.get('workflow_name', 'TREC Form Processing'),
+                execution_time=workflow_details.get('execution_time', now_str),
+                status=workflow_details.get('status', 'Completed Successfully'),
+                execution_id=execution_id
+            )
             
             attachments = [pdf_path] if pdf_path and os.path.exists(pdf_path) else None
             
@@ -233,10 +411,9 @@ Execution ID: {datetime.now().strftime('%Y%m%d_%H%M%S')}
                 f.write(f"Date: {email_msg['Date']}\n\n")
                 
                 # Extract body text
-                for part in email_msg.walk():
-                    if part.get_content_type() == "text/plain":
-                        f.write(part.get_payload())
-                        break
+                body_part = email_msg.get_body(preferencelist=('plain',))
+                if body_part is not None:
+                    f.write(body_part.get_content())
             
             self.logger.info(f"Email draft saved: {file_path}")
             return True
@@ -254,13 +431,17 @@ Execution ID: {datetime.now().strftime('%Y%m%d_%H%M%S')}
         """
         try:
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    config = json_loads(f.read())
                 
                 self.smtp_server = config.get('smtp_server', self.smtp_server)
                 self.smtp_port = config.get('smtp_port', self.smtp_port)
                 self.username = config.get('username', self.username)
-                self.password = config.get('password', self.password)
+                
+                # Passwords live in the OS keyring; a 'password' key is only
+                # honoured for configs written before the keyring migration
+                password = self._get_keyring_password()
+                self.password = password or config.get('password', self.password)
                 
                 self.logger.info("Email configuration loaded successfully")
                 return True
@@ -280,15 +461,21 @@ Execution ID: {datetime.now().strftime('%Y%m%d_%H%M%S')}
             config_path (str): Path to save configuration
         """
         try:
+            # Only non-secret metadata goes to disk
             config = {
                 'smtp_server': self.smtp_server,
                 'smtp_port': self.smtp_port,
-                'username': self.username,
-                'password': self.password
+                'username': self.username
             }
             
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=4)
+            # Leave the existing file alone rather than drop a password the
+            # keyring couldn't take (no keyring module, headless/CI hosts)
+            if self.username and self.password and not self._set_keyring_password():
+                self.logger.error("Email configuration not saved: password could not be stored in the keyring")
+                return False
+
+            with open(config_path, 'wb') as f:
+                f.write(json_dumps(config, indent=True))
             
             self.logger.info(f"Email configuration saved: {config_path}")
             return True
@@ -296,5 +483,26 @@ Execution ID: {datetime.now().strftime('%Y%m%d_%H%M%S')}
         except Exception as e:
             self.logger.error(f"Error saving email configuration: {e}")
             return False
-
+    
+    def _get_keyring_password(self):
+        """Read the SMTP password for the current username from the OS keyring"""
+        if keyring is None or not self.username:
+            return None
+        try:
+            return keyring.get_password(self.KEYRING_SERVICE, self.username)
+        except Exception as e:
+            self.logger.warning(f"Could not read password from keyring: {e}")
+            return None
+    
+    def _set_keyring_password(self):
+        """Store the SMTP password for the current username in the OS keyring"""
+        if keyring is None:
+            self.logger.warning("keyring is not installed; password was not saved")
+            return False
+        try:
+            keyring.set_password(self.KEYRING_SERVICE, self.username, self.password)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not store password in keyring: {e}")
+            return False
 
@@ -0,0 +1,25 @@
+"""
+JSON helpers shared by the RPA modules and the scraping workflow
+Uses orjson when it is installed and falls back to the standard json module
+"""
+
+try:
+    import orjson
+
+    def json_loads(data):
+        """Decode JSON from bytes or str"""
+        return orjson.loads(data)
+
+    def json_dumps(obj, indent=False):
+        """Encode obj as UTF-8 JSON bytes, indented by 2 spaces if indent"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+except ImportError:
+    import json
+
+    def json_loads(data):
+        """Decode JSON from bytes or str"""
+        return json.loads(data)
+
+    def json_dumps(obj, indent=False):
+        """Encode obj as UTF-8 JSON bytes, indented by 2 spaces if indent"""
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
@@ -1,17 +1,265 @@
 import os
+import re
 import sys
+import time
+import itertools
 import fitz  # PyMuPDF
 import logging
+import logging.handlers
+import queue
+import atexit
 from datetime import datetime
 import random
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Field-name keyword -> candidate form_data keys, checked in this order
+_MATCHING_RULES = {
+    # Address related
+    'address': ('property_address', 'buyer_address', 'seller_address'),
+    'street': ('property_address', 'buyer_address', 'seller_address'),
+    'city': ('property_city', 'buyer_city', 'seller_city'),
+    'state': ('property_state', 'buyer_state', 'seller_state'),
+    'zip': ('property_zip', 'buyer_zip', 'seller_zip'),
+    'postal': ('property_zip', 'buyer_zip', 'seller_zip'),
+
+    # Name related
+    'name': ('buyer_name', 'seller_name', 'agent_name'),
+    'buyer': ('buyer_name', 'buyer_address', 'buyer_phone', 'buyer_email'),
+    'seller': ('seller_name', 'seller_address'),
+    'agent': ('agent_name', 'agency_name'),
+
+    # Contact info
+    'phone': ('buyer_phone',),
+    'email': ('buyer_email',),
+
+    # Financial
+    'price': ('sale_price',),
+    'amount': ('sale_price', 'earnest_money'),
+    'earnest': ('earnest_money',),
+    'money': ('earnest_money', 'sale_price'),
+
+    # Dates
+    'date': ('contract_date', 'closing_date', 'date_signed'),
+    'closing': ('closing_date',),
+    'contract': ('contract_date',),
+    'signed': ('date_signed',),
+
+    # Other
+    'property': ('property_address', 'property_type'),
+    'license': ('license_number',),
+    'days': ('contingency_days',),
+    'financing': ('financing_type',),
+
+    # Signature fields
+    'signature1': ('buyer_name',),
+    'signature2': ('seller_name',),
+    'signature3': ('buyer_name',),
+    'signature4': ('seller_name',)
+}
+
+# Sample TREC Form 10-6 data; the date fields are filled in per call
+_INTELLIGENT_DATA_TEMPLATE = {
+    # Property information
+    "property_address": "1234 Oak Street, Austin, TX 78701",
+    "property_city": "Austin",
+    "property_state": "TX",
+    "property_zip": "78701",
+
+    # Buyer information
+    "buyer_name": "01-09-25",
+    "buyer_address": "5678 Elm Avenue, Dallas, TX 75201",
+    "buyer_city": "Dallas",
+    "buyer_state": "TX",
+    "buyer_zip": "75201",
+    "buyer_phone": "(214) 555-0123",
+    "buyer_email": "john.smith@email.com",
+
+    # Seller information
+    "seller_name": "Sarah Jane Johnson",
+    "seller_address": "9876 Pine Road, Houston, TX 77001",
+    "seller_city": "Houston",
+    "seller_state": "TX",
+    "seller_zip": "77001",
+
+    # Contract details
+    "contract_date": None,
+    "sale_price": "$350,000.00",
+    "earnest_money": "$5,000.00",
+    "closing_date": "12/15/2024",
+
+    # Contingency details
+    "contingency_days": "30",
+    "property_type": "Single Family Residence",
+    "financing_type": "Conventional Loan",
+
+    # Additional fields that might be in the form
+    "date_signed": None,
+    "agent_name": "Michael Rodriguez",
+    "agency_name": "Premium Real Estate Group",
+    "license_number": "TX-123456789"
+}
+
+# Display labels for the sample PDF ("buyer_name" -> "Buyer Name")
+_INTELLIGENT_DATA_LABELS = {
+    key: key.replace('_', ' ').title() for key in _INTELLIGENT_DATA_TEMPLATE
+}
+
+
+def _build_keyword_automaton():
+    """Build an Aho-Corasick automaton over the matching rule keywords
+    
+    Each keyword maps to (rule_order, keyword) so hits can be replayed in
+    the same order as the linear scan they replace.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for order, keyword in enumerate(_MATCHING_RULES):
+        automaton.add_word(keyword, (order, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Fallback without pyahocorasick: one compiled alternation instead of a
+# substring scan per keyword. The lookahead makes matches zero-width, so
+# overlapping keywords are all found (no keyword is a prefix of another)
+_KEYWORD_ORDER = {keyword: order for order, keyword in enumerate(_MATCHING_RULES)}
+_KW_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_MATCHING_RULES, key=len, reverse=True)) + "))"
+)
+
+
+def _matching_keywords(field_name_lower):
+    """Return the rule keywords contained in a field name, in rule order"""
+    if _KEYWORD_AUTOMATON is None:
+        hits = {match.group(1) for match in _KW_PATTERN.finditer(field_name_lower)}
+        return sorted(hits, key=_KEYWORD_ORDER.__getitem__)
+    # One pass over the field name finds every keyword occurrence
+    hits = {hit for _, hit in _KEYWORD_AUTOMATON.iter(field_name_lower)}
+    return [keyword for _, keyword in sorted(hits)]
+
+
+def _build_lower_map(form_data):
+    """Map lowercased form_data keys to the original keys (first key wins)"""
+    lower_map = {}
+    for key in form_data:
+        lower_map.setdefault(key.lower(), key)
+    return lower_map
+
+
+def _match_field_value(field_name, form_data, lower_map=None, current_year=None):
+    """Find matching value for a field name
+    
+    Module-level so worker processes can run it without a PDFProcessor.
+    Pass lower_map (from _build_lower_map) and current_year when matching
+    many fields against the same form_data.
+    """
+    field_name_lower = field_name.lower()
+    if lower_map is None:
+        lower_map = _build_lower_map(form_data)
+    
+    # Direct match first
+    original_key = lower_map.get(field_name_lower)
+    if original_key is not None:
+        return str(form_data[original_key])
+    
+    # Special handling for specific TREC Form 10-6 fields
+    if field_name == "20":
+        # This appears to be a year field, return current year
+        if current_year is None:
+            current_year = str(datetime.now().year)
+        return current_year
+    
+    # Partial matches
+    for keyword in _matching_keywords(field_name_lower):
+        for key in _MATCHING_RULES[keyword]:
+            if key in form_data:
+                return str(form_data[key])
+    
+    # Special handling for long field names that might contain key information
+    if 'contingency' in field_name_lower and 'terminate' in field_name_lower:
+        return form_data.get('buyer_name', 'Buyer')
+    
+    if 'terminate automatically' in field_name_lower:
+        return form_data.get('buyer_name', 'Buyer')
+    
+    if 'notices and waivers' in field_name_lower:
+        return '100,000'
+    
+    return None
+
+
+def _process_page(pdf_path, page_num, form_data, current_year=None):
+    """Match form data against the widgets of one page in a worker process
+    
+    Returns (page_num, [(widget_index, new_value), ...]); the parent replays
+    the values onto its own open document and saves once.
+    """
+    lower_map = _build_lower_map(form_data)
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc.load_page(page_num)
+        if page.first_widget is None:
+            matches = []
+        else:
+            matches = [
+                (index, _match_field_value(widget.field_name, form_data, lower_map, current_year))
+                for index, widget in enumerate(page.widgets())
+            ]
+    finally:
+        doc.close()
+    return page_num, matches
+
+
+# Per-process sequence for log file names (pid separates the workflow processes)
+_log_seq = itertools.count()
+
+
+def _close_at_exit(processor_ref):
+    """Flush queued log records of a PDFProcessor that was never closed"""
+    processor = processor_ref()
+    if processor is not None:
+        processor.close()
+
 
 class PDFProcessor:
+    # Parallel matching is opt-in (num_workers > 1): the parent still walks
+    # every widget, so only the matching itself is offloaded and a new pool
+    # per call rarely pays for its startup. Never used below this page count
+    PARALLEL_MIN_PAGES = 4
+    
+    # Log file rotation: size of each file and number of rotated copies kept
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT = 3
+    
     def __init__(self):
         """Initialize PDF Processor"""
         self.logger = self._setup_logging()
         
+        # Per-page widget lists of caller-owned documents, so analyzing and
+        # then filling the same fitz.Document walks each page only once
+        self._widget_cache = weakref.WeakKeyDictionary()
+        
+        # Year for "20" fields, resolved once per fill_pdf_automatically call
+        self._current_year = None
+        
     def _setup_logging(self):
-        """Setup logging configuration"""
+        """
+        Setup logging configuration
+        
+        Records are handed to a QueueHandler and written by a background
+        QueueListener, so the page/widget loops never block on file I/O.
+        """
         logger = logging.getLogger('PDFProcessor')
         logger.setLevel(logging.INFO)
         
@@ -20,8 +268,12 @@ class PDFProcessor:
         os.makedirs(logs_dir, exist_ok=True)
         
         # File handler
-        log_file = os.path.join(logs_dir, f'pdf_processor_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        log_file = os.path.join(
+            logs_dir, f'pdf_processor_{int(time.time())}_{os.getpid()}_{next(_log_seq)}.log'
+        )
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=self.LOG_MAX_BYTES, backupCount=self.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
         file_handler.setLevel(logging.INFO)
         
         # Console handler
@@ -33,8 +285,15 @@ class PDFProcessor:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        log_queue = queue.Queue()
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        atexit.register(_close_at_exit, weakref.ref(self))
+        
+        logger.addHandler(self._queue_handler)
         
         return logger
     
@@ -44,46 +303,11 @@ class PDFProcessor:
             self.logger.info(f"Generating AI data for PDF: {pdf_path}")
             
             # Realistic AI-generated data for TREC Form 10-6
-            intelligent_data = {
-                # Property information
-                "property_address": "1234 Oak Street, Austin, TX 78701",
-                "property_city": "Austin",
-                "property_state": "TX",
-                "property_zip": "78701",
-                
-                # Buyer information
-                "buyer_name": "01-09-25",
-                "buyer_address": "5678 Elm Avenue, Dallas, TX 75201",
-                "buyer_city": "Dallas",
-                "buyer_state": "TX",
-                "buyer_zip": "75201",
-                "buyer_phone": "(214) 555-0123",
-                "buyer_email": "john.smith@email.com",
-                
-                # Seller information
-                "seller_name": "Sarah Jane Johnson",
-                "seller_address": "9876 Pine Road, Houston, TX 77001",
-                "seller_city": "Houston",
-                "seller_state": "TX",
-                "seller_zip": "77001",
-                
-                # Contract details
-                "contract_date": datetime.now().strftime("%m/%d/%Y"),
-                "sale_price": "$350,000.00",
-                "earnest_money": "$5,000.00",
-                "closing_date": "12/15/2024",
-                
-                # Contingency details
-                "contingency_days": "30",
-                "property_type": "Single Family Residence",
-                "financing_type": "Conventional Loan",
-                
-                # Additional fields that might be in the form
-                "date_signed": datetime.now().strftime("%m/%d/%Y"),
-                "agent_name": "Michael Rodriguez",
-                "agency_name": "Premium Real Estate Group",
-                "license_number": "TX-123456789"
-            }
+            now = datetime.now()
+            today = now.strftime("%m/%d/%Y")
+            intelligent_data = dict(_INTELLIGENT_DATA_TEMPLATE)
+            intelligent_data["contract_date"] = today
+            intelligent_data["date_signed"] = today
             
             self.logger.info("AI data generated successfully")
             return intelligent_data
@@ -92,19 +316,82 @@ class PDFProcessor:
             self.logger.error(f"Error generating AI data: {e}")
             return {}
     
+    def close(self):
+        """Stop the background log listener and flush pending records"""
+        listener, self._log_listener = self._log_listener, None
+        if listener is None:
+            return
+        self.logger.removeHandler(self._queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+    
+    def _open_doc(self, path_or_doc):
+        """
+        Open a PDF unless it is already an open document
+        
+        Args:
+            path_or_doc (str or fitz.Document): PDF path or open document
+        
+        Returns:
+            tuple: (doc, owns) where owns tells the caller to close the doc
+        """
+        if isinstance(path_or_doc, fitz.Document):
+            return path_or_doc, False
+        return fitz.open(path_or_doc), True
+    
+    @staticmethod
+    def _release_doc(doc, owns):
+        """Close a document from _open_doc/_open_for_fill if we own it and it is still open"""
+        if owns and doc is not None and not doc.is_closed:
+            doc.close()
+    
+    def _page_widgets(self, doc, page_num, owns):
+        """Return (page, widgets) for a page
+        
+        Widgets are yielded lazily for documents we own (walked once); for
+        caller-owned documents they are cached as a list for reuse. Pages
+        without a first widget are answered with an empty tuple.
+        """
+        if owns:
+            page = doc.load_page(page_num)
+            if page.first_widget is None:
+                return page, ()
+            return page, page.widgets()
+        
+        pages = self._widget_cache.setdefault(doc, {})
+        if page_num not in pages:
+            page = doc.load_page(page_num)
+            widgets = list(page.widgets()) if page.first_widget is not None else []
+            pages[page_num] = (page, widgets)
+        return pages[page_num]
+    
     def analyze_pdf_fields(self, pdf_path):
-        """Analyze PDF form fields"""
+        """
+        Analyze PDF form fields
+        
+        Args:
+            pdf_path (str or fitz.Document): PDF path or an already-open
+                document (left open for the caller to reuse)
+        """
+        doc, owns_doc = None, False
         try:
             self.logger.info(f"Analyzing PDF fields: {pdf_path}")
             
-            doc = fitz.open(pdf_path)
+            doc, owns_doc = self._open_doc(pdf_path)
             fields_found = []
             
             for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
                 # Get form fields (widgets)
-                widgets = list(page.widgets())
+                page, widgets = self._page_widgets(doc, page_num, owns_doc)
                 for widget in widgets:
                     field_info = {
                         'page': page_num,
@@ -114,65 +401,129 @@ class PDFProcessor:
                         'rect': widget.rect
                     }
                     fields_found.append(field_info)
-                    self.logger.info(f"Found field: {field_info}")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"Found field: {field_info}")
             
-            doc.close()
             self.logger.info(f"Found {len(fields_found)} form fields")
             return fields_found
             
         except Exception as e:
             self.logger.error(f"Error analyzing PDF fields: {e}")
             return []
+        finally:
+            # Also on errors mid-loop, so the file handle and MuPDF memory are released
+            self._release_doc(doc, owns_doc)
     
-    def fill_pdf_automatically(self, input_pdf_path, form_data, output_pdf_path):
-        """Fill PDF form fields automatically with proper field mapping"""
+    def fill_pdf_automatically(self, input_pdf_path, form_data, output_pdf_path, num_workers=1):
+        """
+        Fill PDF form fields automatically with proper field mapping
+        
+        Args:
+            input_pdf_path (str or fitz.Document): PDF form to fill, or an
+                already-open document (saved but left open for the caller)
+            form_data (dict): Values keyed by form data field
+            output_pdf_path (str): Where to save the filled PDF
+            num_workers (int): Worker processes used to match fields on
+                multi-page forms (default 1: match in this process)
+        """
+        doc, owns_doc, tmp_path = None, False, None
         try:
             self.logger.info(f"Filling PDF: {input_pdf_path}")
             self.logger.info(f"Output will be saved to: {output_pdf_path}")
             
-            # Open the PDF
-            doc = fitz.open(input_pdf_path)
-            filled_any_field = False
+            # Open the PDF (a temporary copy next to the output when it can be saved incrementally)
+            doc, owns_doc, incremental, tmp_path = self._open_for_fill(input_pdf_path, output_pdf_path)
+            
+            # No AcroForm at all (flat or scanned PDF): skip the page walk.
+            # _open_for_fill made no copy, so the fallback reuses the open doc
+            if not doc.is_form_pdf:
+                self.logger.warning("❌ PDF has no form fields")
+                return self._fill_pdf_with_text_replacement(doc, form_data, output_pdf_path)
+            
+            pending_updates = []
+            self._current_year = str(datetime.now().year)
+            
+            # Match widgets against form data, in parallel for larger forms.
+            # Workers re-open the file, so an open doc must be unmodified on disk
+            if owns_doc:
+                source_path = input_pdf_path
+            elif doc.name and not doc.is_dirty and os.path.isfile(doc.name):
+                source_path = doc.name
+            else:
+                source_path = None
+            page_matches = None
+            if source_path:
+                page_matches = self._match_pages_parallel(source_path, len(doc), form_data, num_workers)
+            
+            # Lowercased form_data keys, built once for O(1) direct matches
+            lower_map = _build_lower_map(form_data)
             
             # Iterate through all pages
             for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
                 # Get all widgets (form fields) on this page
-                widgets = list(page.widgets())
-                self.logger.info(f"Page {page_num + 1}: Found {len(widgets)} widgets")
+                page, widgets = self._page_widgets(doc, page_num, owns_doc)
+                widget_count = 0
                 
-                for widget in widgets:
+                for index, widget in enumerate(widgets):
+                    widget_count += 1
                     field_name = widget.field_name
-                    field_type = widget.field_type_string
-                    current_value = widget.field_value
                     
-                    self.logger.info(f"Processing field: {field_name} (Type: {field_type}, Current: {current_value})")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            f"Processing field: {field_name} "
+                            f"(Type: {widget.field_type_string}, Current: {widget.field_value})"
+                        )
                     
                     # Try to find matching data for this field
-                    new_value = self._find_matching_value(field_name, form_data)
+                    if page_matches is not None:
+                        new_value = page_matches[page_num].get(index)
+                    else:
+                        new_value = self._find_matching_value(field_name, form_data, lower_map)
                     
                     if new_value:
-                        try:
-                            # Update the widget value
-                            widget.field_value = new_value
-                            widget.update()
-                            filled_any_field = True
-                            self.logger.info(f"✅ Filled field '{field_name}' with: {new_value}")
-                        except Exception as e:
-                            self.logger.error(f"❌ Failed to fill field '{field_name}': {e}")
+                        pending_updates.append((page, widget, field_name, new_value))
                     else:
                         self.logger.warning(f"⚠️ No matching value found for field: {field_name}")
+                
+                self.logger.info(f"Page {page_num + 1}: Found {widget_count} widgets")
+            
+            # Apply all widget updates in one pass
+            filled_any_field = False
+            for page, widget, field_name, new_value in pending_updates:
+                try:
+                    # Update the widget value
+                    widget.field_value = new_value
+                    widget.update()
+                    filled_any_field = True
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"✅ Filled field '{field_name}' with: {new_value}")
+                except Exception as e:
+                    self.logger.error(f"❌ Failed to fill field '{field_name}': {e}")
             
             if filled_any_field:
                 # Save the filled PDF
-                doc.save(output_pdf_path, garbage=4, deflate=True)
+                if incremental:
+                    # Only the changed objects are appended to the file
+                    doc.saveIncr()
+                    if tmp_path:
+                        # Closed first so the copy can be renamed on Windows;
+                        # any earlier output is only replaced once the save worked
+                        self._release_doc(doc, owns_doc)
+                        os.replace(tmp_path, output_pdf_path)
+                        tmp_path = None
+                else:
+                    # Fills only orphan the old appearance streams, which
+                    # garbage=2 drops without garbage=4's duplicate scan
+                    doc.save(output_pdf_path, garbage=2, deflate=True)
                 self.logger.info(f"✅ PDF saved successfully: {output_pdf_path}")
-                doc.close()
                 return output_pdf_path
             else:
                 self.logger.warning("❌ No fields were filled")
-                doc.close()
+                # Closed before the copy can be removed (and the fallback reopens it)
+                self._release_doc(doc, owns_doc)
+                if tmp_path:
+                    self._remove_copy(tmp_path)
+                    tmp_path = None
                 
                 # Try alternative method using text replacement
                 return self._fill_pdf_with_text_replacement(input_pdf_path, form_data, output_pdf_path)
@@ -180,147 +531,168 @@ class PDFProcessor:
         except Exception as e:
             self.logger.error(f"Error filling PDF: {e}")
             return None
+        finally:
+            self._release_doc(doc, owns_doc)
+            # An unsaved fill only leaves the temporary copy behind
+            if tmp_path:
+                self._remove_copy(tmp_path)
     
-    def _find_matching_value(self, field_name, form_data):
-        """Find matching value for a field name"""
-        field_name_lower = field_name.lower()
-        
-        # Direct match first
-        for key, value in form_data.items():
-            if key.lower() == field_name_lower:
-                return str(value)
+    def _remove_copy(self, path):
+        """Delete the temporary input copy made by _open_for_fill"""
+        try:
+            os.remove(path)
+        except OSError as e:
+            self.logger.warning(f"Could not remove unfilled copy {path}: {e}")
+    
+    def _open_for_fill(self, input_pdf_path, output_pdf_path):
+        """
+        Open the document to fill, preferring one that can be saved incrementally
         
-        # Special handling for specific TREC Form 10-6 fields
-        if field_name == "20":
-            # This appears to be a year field, return current year
-            return str(datetime.now().year)
+        Flat PDFs (no AcroForm) are returned as opened, for the text fallback.
+        When writing a form to a new file, the input is copied to a temporary
+        file in the output directory and the copy is opened, so saving appends
+        only the changed objects. The caller moves the copy onto the output path after
+        a successful save and removes it otherwise, so a failed fill never
+        touches an existing output file.
         
-        # Partial matches
-        matching_rules = {
-            # Address related
-            'address': ['property_address', 'buyer_address', 'seller_address'],
-            'street': ['property_address', 'buyer_address', 'seller_address'],
-            'city': ['property_city', 'buyer_city', 'seller_city'],
-            'state': ['property_state', 'buyer_state', 'seller_state'],
-            'zip': ['property_zip', 'buyer_zip', 'seller_zip'],
-            'postal': ['property_zip', 'buyer_zip', 'seller_zip'],
-            
-            # Name related
-            'name': ['buyer_name', 'seller_name', 'agent_name'],
-            'buyer': ['buyer_name', 'buyer_address', 'buyer_phone', 'buyer_email'],
-            'seller': ['seller_name', 'seller_address'],
-            'agent': ['agent_name', 'agency_name'],
-            
-            # Contact info
-            'phone': ['buyer_phone'],
-            'email': ['buyer_email'],
-            
-            # Financial
-            'price': ['sale_price'],
-            'amount': ['sale_price', 'earnest_money'],
-            'earnest': ['earnest_money'],
-            'money': ['earnest_money', 'sale_price'],
-            
-            # Dates
-            'date': ['contract_date', 'closing_date', 'date_signed'],
-            'closing': ['closing_date'],
-            'contract': ['contract_date'],
-            'signed': ['date_signed'],
-            
-            # Other
-            'property': ['property_address', 'property_type'],
-            'license': ['license_number'],
-            'days': ['contingency_days'],
-            'financing': ['financing_type'],
-            
-            # Signature fields
-            'signature1': ['buyer_name'],
-            'signature2': ['seller_name'],
-            'signature3': ['buyer_name'],
-            'signature4': ['seller_name']
-        }
+        Returns:
+            tuple: (doc, owns_doc, incremental, tmp_path), tmp_path being
+            None when no copy was made
+        """
+        if isinstance(input_pdf_path, fitz.Document):
+            doc = input_pdf_path
+            same_file = bool(doc.name) and os.path.abspath(doc.name) == os.path.abspath(output_pdf_path)
+            return doc, False, same_file and doc.can_save_incrementally(), None
         
-        # Check partial matches
-        for keyword, potential_keys in matching_rules.items():
-            if keyword in field_name_lower:
-                for key in potential_keys:
-                    if key in form_data:
-                        return str(form_data[key])
+        # Checked on the input itself, before any copy is made
+        doc = fitz.open(input_pdf_path)
+        try:
+            if not doc.is_form_pdf:
+                return doc, True, False, None
+            incremental = doc.can_save_incrementally()
+        except Exception:
+            doc.close()
+            raise
         
-        # Special handling for long field names that might contain key information
-        if 'contingency' in field_name_lower and 'terminate' in field_name_lower:
-            return form_data.get('buyer_name', 'Buyer')
+        # Filled in place, or (e.g. encrypted or repaired files) rewritten with save()
+        if not incremental or os.path.abspath(input_pdf_path) == os.path.abspath(output_pdf_path):
+            return doc, True, incremental, None
+        doc.close()
         
-        if 'terminate automatically' in field_name_lower:
-            return form_data.get('buyer_name', 'Buyer')
+        fd, tmp_path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(os.path.abspath(output_pdf_path)))
+        os.close(fd)
+        try:
+            # copy() also takes the input's permissions instead of mkstemp's 0600
+            shutil.copy(input_pdf_path, tmp_path)
+            return fitz.open(tmp_path), True, True, tmp_path
+        except Exception:
+            self._remove_copy(tmp_path)
+            raise
+    
+    def _match_pages_parallel(self, pdf_path, page_count, form_data, num_workers=1):
+        """
+        Match widgets to form data page-by-page in a process pool
         
-        if 'notices and waivers' in field_name_lower:
-            return '100,000'
+        Returns:
+            dict: {page_num: {widget_index: new_value}}, or None when no pool
+            was requested or the form is too small (caller matches inline)
+        """
+        if not num_workers or num_workers <= 1 or page_count < self.PARALLEL_MIN_PAGES:
+            return None
         
-        return None
+        try:
+            self.logger.info(f"Matching {page_count} pages with {num_workers} worker processes")
+            with ProcessPoolExecutor(max_workers=min(num_workers, page_count)) as executor:
+                results = executor.map(
+                    _process_page,
+                    [pdf_path] * page_count,
+                    range(page_count),
+                    [form_data] * page_count,
+                    [self._current_year] * page_count
+                )
+                return {page_num: dict(matches) for page_num, matches in results}
+        except Exception as e:
+            self.logger.warning(f"Parallel field matching failed, falling back to sequential: {e}")
+            return None
+    
+    def _find_matching_value(self, field_name, form_data, lower_map=None):
+        """Find matching value for a field name"""
+        return _match_field_value(field_name, form_data, lower_map, self._current_year)
     
     def _fill_pdf_with_text_replacement(self, input_pdf_path, form_data, output_pdf_path):
         """Alternative method: Fill PDF by replacing placeholder text"""
+        doc, owns_doc = None, False
         try:
             self.logger.info("Trying alternative method: text replacement")
             
-            doc = fitz.open(input_pdf_path)
+            doc, owns_doc = self._open_doc(input_pdf_path)
+            
+            # Add text at specific locations (you may need to adjust coordinates).
+            # These depend only on form_data, so they are built once for all pages
+            text_insertions = [
+                {"text": form_data.get('property_address', ''), "point": (100, 200)},
+                {"text": form_data.get('buyer_name', ''), "point": (100, 250)},
+                {"text": form_data.get('seller_name', ''), "point": (100, 300)},
+                {"text": form_data.get('sale_price', ''), "point": (400, 200)},
+                {"text": form_data.get('contract_date', ''), "point": (400, 250)},
+            ]
+            text_insertions = [insertion for insertion in text_insertions if insertion["text"]]
             
             # Create a new PDF with text overlays
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Add text at specific locations (you may need to adjust coordinates)
-                text_insertions = [
-                    {"text": form_data.get('property_address', ''), "point": (100, 200)},
-                    {"text": form_data.get('buyer_name', ''), "point": (100, 250)},
-                    {"text": form_data.get('seller_name', ''), "point": (100, 300)},
-                    {"text": form_data.get('sale_price', ''), "point": (400, 200)},
-                    {"text": form_data.get('contract_date', ''), "point": (400, 250)},
-                ]
-                
-                for insertion in text_insertions:
-                    if insertion["text"]:
-                        page.insert_text(
-                            insertion["point"],
-                            insertion["text"],
-                            fontsize=10,
-                            color=(0, 0, 0)
-                        )
+            if text_insertions:
+                # One TextWriter per page size; each emits a single content-stream write
+                writers = {}
+                for page_num in range(len(doc)):
+                    page = doc.load_page(page_num)
+                    
+                    rect_key = tuple(page.rect)
+                    writer = writers.get(rect_key)
+                    if writer is None:
+                        writer = fitz.TextWriter(page.rect)
+                        for insertion in text_insertions:
+                            writer.append(insertion["point"], insertion["text"], fontsize=10)
+                        writers[rect_key] = writer
+                    
+                    writer.write_text(page, color=(0, 0, 0))
             
             doc.save(output_pdf_path)
-            doc.close()
             self.logger.info(f"✅ PDF filled with text replacement method: {output_pdf_path}")
             return output_pdf_path
             
         except Exception as e:
             self.logger.error(f"Error with text replacement method: {e}")
             return None
+        finally:
+            self._release_doc(doc, owns_doc)
     
     def create_sample_filled_pdf(self, output_path):
         """Create a sample filled PDF for testing"""
         try:
             self.logger.info("Creating sample filled PDF")
             
-            # Create a new PDF document
-            doc = fitz.open()
-            page = doc.new_page()
-            
-            # Add title
-            page.insert_text((50, 50), "TREC Form 10-6 - Addendum for Sale of Other Property by Buyer", 
-                           fontsize=14, color=(0, 0, 0))
-            
-            # Add form data
-            form_data = self.generate_form_data_with_gemini("")
-            y_position = 100
-            
-            for key, value in form_data.items():
-                page.insert_text((50, y_position), f"{key.replace('_', ' ').title()}: {value}", 
-                               fontsize=10, color=(0, 0, 0))
-                y_position += 20
-            
-            doc.save(output_path)
-            doc.close()
+            # Create a new PDF document (closed by the with block, also on errors)
+            with fitz.open() as doc:
+                page = doc.new_page()
+                
+                # Collect all lines in one TextWriter and write them in a single call
+                writer = fitz.TextWriter(page.rect)
+                
+                # Add title
+                writer.append((50, 50), "TREC Form 10-6 - Addendum for Sale of Other Property by Buyer", 
+                              fontsize=14)
+                
+                # Add form data
+                form_data = self.generate_form_data_with_gemini("")
+                y_position = 100
+                
+                for key, value in form_data.items():
+                    label = _INTELLIGENT_DATA_LABELS.get(key) or key.replace('_', ' ').title()
+                    writer.append((50, y_position), f"{label}: {value}", fontsize=10)
+                    y_position += 20
+                
+                writer.write_text(page, color=(0, 0, 0))
+                
+                doc.save(output_path)
             
             self.logger.info(f"Sample PDF created: {output_path}")
             return output_path
@@ -0,0 +1,178 @@
+"""
+Scrape Worker Pool
+Persistent scraping processes fed by a job queue, with one CSV writer process
+"""
+
+import os
+import queue
+import logging
+import multiprocessing
+
+from web_scraping_workflow import WebScrapingWorkflow, target_csv, open_csv
+
+# Rows per message sent from a worker to the writer
+CHUNK_ROWS = 100
+
+# Seconds to keep waiting for results once every worker has exited
+IDLE_TIMEOUT = 10
+
+
+class ScrapeWorker(multiprocessing.Process):
+    """
+    Worker process owning one WebScrapingWorkflow (and browser) for its lifetime
+
+    Receives (job_id, target) jobs on in_q until a None sentinel. Rows are
+    sent to out_q in chunks as ('rows', job_id, target, rows), followed by
+    ('done', job_id, target, error) for every job.
+    """
+
+    def __init__(self, in_q, out_q, headless=True):
+        super().__init__(daemon=True)
+        self.in_q = in_q
+        self.out_q = out_q
+        self.headless = headless
+
+    def run(self):
+        # The browser (started only if a page needs it) is reused for every job
+        workflow = WebScrapingWorkflow(headless=self.headless)
+        try:
+            while True:
+                job = self.in_q.get()
+                if job is None:
+                    break
+                job_id, target = job
+
+                error = None
+                try:
+                    chunk = []
+                    for row in workflow.iter_target_rows(target):
+                        chunk.append(row)
+                        if len(chunk) >= CHUNK_ROWS:
+                            self.out_q.put(('rows', job_id, target, chunk))
+                            chunk = []
+                    if chunk:
+                        self.out_q.put(('rows', job_id, target, chunk))
+                except Exception as e:
+                    error = str(e)
+                self.out_q.put(('done', job_id, target, error))
+        finally:
+            workflow.close_webdriver()
+
+
+class CSVWriterProcess(multiprocessing.Process):
+    """
+    Single process that owns every output CSV file
+
+    Consumes worker messages from in_q until a None sentinel and reports
+    (job_id, rows_written, error) on done_q when a job's file is complete.
+    """
+
+    def __init__(self, in_q, done_q):
+        super().__init__(daemon=True)
+        self.in_q = in_q
+        self.done_q = done_q
+
+    def run(self):
+        # job_id -> [file, csv writer, rows written]
+        open_files = {}
+        while True:
+            message = self.in_q.get()
+            if message is None:
+                break
+            kind, job_id, target, payload = message
+
+            if kind == 'done':
+                entry = open_files.pop(job_id, None)
+                count = 0
+                if entry is not None:
+                    entry[0].close()
+                    count = entry[2]
+                self.done_q.put((job_id, count, payload))
+                continue
+
+            try:
+                entry = open_files.get(job_id)
+                if entry is None:
+                    csvfile, writer = open_csv(*target_csv(target))
+                    entry = open_files[job_id] = [csvfile, writer, 0]
+
+                # Rows arrive as tuples in header order
+                entry[1].writerows(payload)
+                entry[2] += len(payload)
+                # Keep the file readable while the scrape is still running
+                entry[0].flush()
+            except Exception as e:
+                self.done_q.put((job_id, entry[2] if entry else 0, f"CSV write failed: {e}"))
+
+        for entry in open_files.values():
+            entry[0].close()
+
+
+def run_scrape_pool(targets, headless=True, num_workers=None, logger=None):
+    """
+    Scrape targets on a pool of worker processes and write one CSV per target
+
+    Args:
+        targets (list): Entries like web_scraping_workflow.SCRAPE_TARGETS
+        headless (bool): Run the workers' browsers without a window
+        num_workers (int): Worker processes (default: min(len(targets), cpu_count))
+        logger (logging.Logger): Where to report progress and errors
+
+    Returns:
+        list: (rows written, error or None) per target, in target order
+    """
+    logger = logger or logging.getLogger('WebScrapingWorkflow')
+    if num_workers is None:
+        num_workers = min(len(targets), os.cpu_count() or 1)
+
+    job_q = multiprocessing.Queue()
+    row_q = multiprocessing.Queue()
+    done_q = multiprocessing.Queue()
+
+    writer = CSVWriterProcess(row_q, done_q)
+    workers = [ScrapeWorker(job_q, row_q, headless=headless) for _ in range(num_workers)]
+    logger.info(f"Scraping {len(targets)} targets with {num_workers} worker processes")
+    writer.start()
+    for worker in workers:
+        worker.start()
+
+    for job_id, target in enumerate(targets):
+        job_q.put((job_id, target))
+    for _ in workers:
+        job_q.put(None)
+
+    results = [(0, None)] * len(targets)
+    pending = set(range(len(targets)))
+    idle = 0
+    try:
+        while pending:
+            try:
+                job_id, count, error = done_q.get(timeout=1)
+            except queue.Empty:
+                # Don't wait forever on workers that died without reporting
+                if not writer.is_alive():
+                    break
+                if not any(worker.is_alive() for worker in workers):
+                    idle += 1
+                    if idle >= IDLE_TIMEOUT:
+                        break
+                continue
+
+            results[job_id] = (count, error)
+            if error:
+                logger.error(f"Error scraping {targets[job_id]['kind']}: {error}")
+            pending.discard(job_id)
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+        row_q.put(None)
+        writer.join(timeout=5)
+        for process in workers + [writer]:
+            if process.is_alive():
+                process.terminate()
+
+    if pending:
+        logger.warning(f"No result for {len(pending)} scrape targets")
+        for job_id in pending:
+            results[job_id] = (0, "no result from the worker pool")
+    return results
@@ -0,0 +1,141 @@
+"""
+Playwright Scraping Backend
+Async alternative to the Selenium browser used by WebScrapingWorkflow
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+from modules.jsonutil import json_loads
+from web_scraping_workflow import (
+    _NEWS_EXTRACT_JS, _PRODUCTS_EXTRACT_JS,
+    _SEL_ATHING, _SEL_PRODUCT_POD,
+    _CSS_NEWS_TITLE, _CSS_NEWS_SCORE,
+    _CSS_PRODUCT_TITLE, _CSS_PRODUCT_PRICE, _CSS_PRODUCT_RATING,
+    USER_AGENT,
+)
+
+# Default page per target kind, same as the WebScrapingWorkflow scrapers
+DEFAULT_URLS = {
+    'news': "https://news.ycombinator.com",
+    'products': "https://books.toscrape.com",
+}
+
+# Target kind -> (row selector, extraction script, per-field selectors)
+_EXTRACTORS = {
+    'news': (_SEL_ATHING[1], _NEWS_EXTRACT_JS, (_CSS_NEWS_TITLE, _CSS_NEWS_SCORE)),
+    'products': (
+        _SEL_PRODUCT_POD[1], _PRODUCTS_EXTRACT_JS,
+        (_CSS_PRODUCT_TITLE, _CSS_PRODUCT_PRICE, _CSS_PRODUCT_RATING)
+    ),
+}
+
+# Subresources the scrapers never read
+_BLOCKED_RESOURCES = frozenset({"image", "stylesheet", "font", "media"})
+
+
+def _as_page_function(script):
+    """Wrap a Selenium execute_script body (uses `arguments`) for page.evaluate"""
+    return f"(args) => (function() {{{script}}}).apply(null, args)"
+
+
+class PlaywrightBackend:
+    """
+    Scrape with one Playwright Chromium and one browser context per target
+
+    Targets run concurrently on asyncio instead of one process per driver.
+    """
+
+    WAIT_TIMEOUT_MS = 15000
+
+    def __init__(self, headless=True, logger=None):
+        """Initialize Playwright backend"""
+        if async_playwright is None:
+            raise ImportError("playwright is not installed (pip install playwright && playwright install chromium)")
+        self.headless = headless
+        self.logger = logger or logging.getLogger('WebScrapingWorkflow')
+
+    async def _block_subresources(self, route):
+        """Abort requests for images/CSS/fonts, continue everything else"""
+        if route.request.resource_type in _BLOCKED_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _scrape_target(self, browser, target):
+        """Scrape one target in its own browser context"""
+        kind = target['kind']
+        url = target.get('url') or DEFAULT_URLS[kind]
+        row_selector, script, field_selectors = _EXTRACTORS[kind]
+
+        context = await browser.new_context(user_agent=USER_AGENT)
+        try:
+            await context.route("**/*", self._block_subresources)
+            page = await context.new_page()
+            self.logger.info(f"🎭 Scraping {kind} from: {url}")
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector(row_selector, timeout=self.WAIT_TIMEOUT_MS)
+
+            # The scripts return one JSON string
+            rows = json_loads(await page.evaluate(
+                _as_page_function(script),
+                [target['max_items'], row_selector, *field_selectors]
+            ))
+        finally:
+            await context.close()
+
+        # One timestamp for the whole scrape
+        scraped_at = datetime.now().isoformat()
+        rows = [(*row, scraped_at) for row in rows]
+        self.logger.info(f"✅ Scraped {len(rows)} {kind} rows from: {url}")
+        return rows
+
+    async def scrape_many_async(self, targets, return_exceptions=False):
+        """
+        Scrape all targets concurrently with a single browser
+
+        Args:
+            targets (list): Dicts with 'kind' ('news' or 'products'),
+                'max_items' and an optional 'url'
+            return_exceptions (bool): Return the exception of a failed target
+                instead of []
+
+        Returns:
+            list: Scraped rows per target, in target order ([] for failures)
+        """
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=self.headless)
+            try:
+                results = await asyncio.gather(
+                    *[self._scrape_target(browser, target) for target in targets],
+                    return_exceptions=True
+                )
+            finally:
+                await browser.close()
+
+        scraped = []
+        for target, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error scraping {target['kind']}: {result}")
+                if not return_exceptions:
+                    result = []
+            scraped.append(result)
+        return scraped
+
+    def scrape_many(self, targets, return_exceptions=False):
+        """Synchronous wrapper around scrape_many_async"""
+        return asyncio.run(self.scrape_many_async(targets, return_exceptions))
+
+    def scrape_news_articles(self, url=DEFAULT_URLS['news'], max_articles=10):
+        """Scrape news articles from a website"""
+        return self.scrape_many([{'kind': 'news', 'url': url, 'max_items': max_articles}])[0]
+
+    def scrape_product_data(self, url=DEFAULT_URLS['products'], max_products=20):
+        """Scrape product data from an e-commerce site"""
+        return self.scrape_many([{'kind': 'products', 'url': url, 'max_items': max_products}])[0]
@@ -1,12 +1,19 @@
+import asyncio
+import io
+import itertools
 import os
 import sys
 import uuid
 import json
-import signal
+import shutil
 import subprocess
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+import psutil
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -23,19 +30,13 @@ class StopRequest(BaseModel):
 
 app = FastAPI(title="PDF-AGENT Workflow API")
 
-# Allow local dev origins by default
-origins = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    "*"  # Allow all origins for development
-]
+# Allow all origins for development (covers the local dev hosts on :5173/:3000).
+# A bare wildcard lets Starlette skip the per-request origin comparison
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=["*"],
     allow_credentials=False,  # Set to False when using wildcard
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["*"],
     allow_headers=["*"],
 )
 
@@ -48,39 +49,174 @@ class ProcInfo(BaseModel):
     log_file: str
 
 
-processes: Dict[str, ProcInfo] = {}
+class ProcessRegistry:
+    """Running workflow processes, indexed by proc_id and by PID"""
 
+    def __init__(self) -> None:
+        self._by_id: Dict[str, ProcInfo] = {}
+        self._pid_index: Dict[int, str] = {}
+        self._lock = threading.Lock()
 
+    def add(self, proc_id: str, info: ProcInfo) -> None:
+        with self._lock:
+            self._by_id[proc_id] = info
+            self._pid_index[info.pid] = proc_id
+
+    def get_by_pid(self, pid: int) -> Optional[ProcInfo]:
+        with self._lock:
+            proc_id = self._pid_index.get(pid)
+            return self._by_id.get(proc_id) if proc_id is not None else None
+
+    def pop_by_pid(self, pid: int) -> Optional[ProcInfo]:
+        with self._lock:
+            proc_id = self._pid_index.pop(pid, None)
+            return self._by_id.pop(proc_id) if proc_id is not None else None
+
+    def values(self) -> List[ProcInfo]:
+        with self._lock:
+            return list(self._by_id.values())
+
+
+processes = ProcessRegistry()
+
+
+# The paths below never change within a process, so each is resolved once
+
+@lru_cache(maxsize=1)
 def _workspace_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__))
 
 
+@lru_cache(maxsize=1)
 def _python_exe() -> str:
     # Try to use virtual environment Python first
     venv_python = os.path.join(_workspace_dir(), ".venv", "Scripts", "python.exe")
     if os.path.exists(venv_python):
-        print(f"[DEBUG] Using virtual environment Python: {venv_python}")
         return venv_python
     
     # Fallback to system Python
-    python_exe = sys.executable or "python"
-    print(f"[DEBUG] Using system Python: {python_exe}")
-    return python_exe
+    return sys.executable or "python"
 
 
+@lru_cache(maxsize=1)
 def _logs_dir() -> str:
     path = os.path.join(_workspace_dir(), "logs")
     os.makedirs(path, exist_ok=True)
     return path
 
 
+print(f"[DEBUG] Using Python interpreter: {_python_exe()}")
+
+
+# Sequence number making workflow log names unique within the same second
+_log_seq = itertools.count()
+
+
+def _tail_lines(path: str, n: int = 200, block: int = 8192) -> List[str]:
+    """Return the last n lines of a file, reading backwards from the end"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks = []
+        newlines = 0
+        # n + 1 newlines guarantee the last n lines are complete
+        while pos > 0 and newlines <= n:
+            size = min(block, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks)).decode("utf-8", errors="ignore")
+    # StringIO applies the same universal-newline handling as text-mode reads
+    return io.StringIO(data, newline=None).readlines()[-n:]
+
+
+# Workflow logs longer than this are cut down to their last _LOG_MAX_BYTES on stop
+_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+
+def _trim_log_head(path: str, max_bytes: int = _LOG_MAX_BYTES) -> None:
+    """Drop the head of a log file so that at most max_bytes remain
+    
+    The tail is written to a temporary file and swapped in with os.replace,
+    so a process still holding the old file only writes to the unlinked copy.
+    """
+    if os.path.getsize(path) <= max_bytes:
+        return
+    tmp_path = path + ".tmp"
+    with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+        start = src.seek(-max_bytes - 1, os.SEEK_END) + 1
+        # Skip the partial line the cut lands in, unless it lands on a line
+        # start; with no newline in the tail at all, keep the raw tail
+        if src.read(1) != b"\n":
+            src.readline()
+            if not src.read(1):
+                src.seek(start)
+            else:
+                src.seek(-1, os.SEEK_CUR)
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, path)
+
+
+def _is_alive(pid: int) -> bool:
+    """Check whether a process exists without spawning a helper process"""
+    if os.name == "nt":
+        # OpenProcess-based lookup instead of running tasklist.exe
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists but owned by another user
+        return True
+    return True
+
+
+def _terminate_tree(pid: int, timeout: float = 5.0) -> None:
+    """Terminate a process and its children, killing whatever outlives timeout"""
+    try:
+        parent = psutil.Process(pid)
+        procs = parent.children(recursive=True) + [parent]
+    except psutil.NoSuchProcess:
+        return
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, still_alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in still_alive:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+# log path -> ((mtime_ns, size), tail lines) from the previous status poll
+_tail_cache: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+
+
+def _cached_tail_lines(path: str, n: int = 200) -> List[str]:
+    """_tail_lines, reusing the last result while the file is unchanged"""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _tail_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    lines = _tail_lines(path, n)
+    _tail_cache[path] = (key, lines)
+    return lines
+
+
 @app.get("/workflows")
 def list_workflows():
-    return {"running": list(processes.values())}
+    return {"running": processes.values()}
 
 
 @app.post("/workflows/start")
-def start_workflow(req: StartRequest):
+async def start_workflow(req: StartRequest):
     print(f"[DEBUG] Starting workflow: {req.workflow_id}, script: {req.script_path}")
     
     script_abs = os.path.join(_workspace_dir(), req.script_path)
@@ -91,11 +227,14 @@ def start_workflow(req: StartRequest):
         raise HTTPException(status_code=404, detail=f"Script not found: {req.script_path}")
 
     log_path = os.path.join(
-        _logs_dir(), f"workflow_{req.workflow_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        _logs_dir(), f"workflow_{req.workflow_id}_{int(time.time())}_{next(_log_seq)}.log"
     )
     print(f"[DEBUG] Log file: {log_path}")
     
-    log_fp = open(log_path, "w", encoding="utf-8", errors="replace")
+    # File and process creation block, so they run off the event loop.
+    # Unbuffered binary: the child writes through its own copy of the fd and
+    # does its own UTF-8 encoding (PYTHONIOENCODING below)
+    log_fp = await asyncio.to_thread(open, log_path, "wb", buffering=0)
 
     # Launch subprocess non-blocking, capture stdout/stderr to log file
     try:
@@ -113,92 +252,79 @@ def start_workflow(req: StartRequest):
         if req.script_path in ['final_complete_workflow.py', 'fill_and_send_workflow.py', 'web_scraping_workflow.py', 'data_processing_workflow.py', 'email_automation_workflow.py', 'file_management_workflow.py']:
             python_cmd.append('--non-interactive')
         
-        proc = subprocess.Popen(
+        proc = await asyncio.to_thread(
+            subprocess.Popen,
             python_cmd,
             cwd=_workspace_dir(),
             stdout=log_fp,
             stderr=subprocess.STDOUT,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
             env=env,
             creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
         )
         print(f"[DEBUG] Process started with PID: {proc.pid}")
     except Exception as e:
-        log_fp.close()
         print(f"[ERROR] Failed to start process: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start process: {e}")
+    finally:
+        # The child inherited its own handle; the parent's copy is not needed
+        log_fp.close()
 
     proc_id = str(uuid.uuid4())
-    processes[proc_id] = ProcInfo(
+    processes.add(proc_id, ProcInfo(
         pid=proc.pid,
         workflow_id=req.workflow_id,
         script_path=req.script_path,
         started_at=datetime.now().isoformat(),
         log_file=log_path,
-    )
+    ))
     
     print(f"[DEBUG] Process registered with ID: {proc_id}")
     return {"success": True, "proc_id": proc_id, "pid": proc.pid, "log_file": log_path}
 
 
 @app.post("/workflows/stop")
-def stop_workflow(req: StopRequest):
+async def stop_workflow(req: StopRequest):
     # Find proc by pid
-    target_key: Optional[str] = None
-    for key, info in processes.items():
-        if info.pid == req.pid:
-            target_key = key
-            break
-
-    if target_key is None:
+    if processes.get_by_pid(req.pid) is None:
         raise HTTPException(status_code=404, detail=f"PID not tracked: {req.pid}")
 
     try:
-        if os.name == "nt":
-            # Send CTRL-BREAK like signal to the process group; fallback to taskkill
-            try:
-                subprocess.run(["taskkill", "/PID", str(req.pid), "/T", "/F"], check=True)
-            except subprocess.CalledProcessError:
-                pass
-        else:
-            os.kill(req.pid, signal.SIGTERM)
+        # Same effect as "taskkill /T /F" without spawning taskkill.exe, and
+        # it waits for the processes to exit, so nothing writes to the log
+        # after its head is trimmed below
+        await asyncio.to_thread(_terminate_tree, req.pid)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to stop process: {e}")
 
-    info = processes.pop(target_key)
+    info = processes.pop_by_pid(req.pid)
+    if info is None:
+        # A concurrent stop request already removed it
+        raise HTTPException(status_code=404, detail=f"PID not tracked: {req.pid}")
+    _tail_cache.pop(info.log_file, None)
+    try:
+        await asyncio.to_thread(_trim_log_head, info.log_file)
+    except OSError as e:
+        print(f"[WARN] Could not trim log file {info.log_file}: {e}")
     return {"success": True, "stopped": info}
 
 
 @app.get("/workflows/status/{pid}")
-def workflow_status(pid: int):
+async def workflow_status(pid: int):
     # Determine if pid is alive
-    alive = False
     try:
-        if os.name == "nt":
-            # tasklist check
-            out = subprocess.check_output(["tasklist", "/FI", f"PID eq {pid}"], text=True)
-            alive = str(pid) in out
-        else:
-            os.kill(pid, 0)
-            alive = True
+        alive = _is_alive(pid)
     except Exception:
         alive = False
 
     # Read last N lines from log, if exists
     log_lines = []
-    log_file = None
-    for info in processes.values():
-        if info.pid == pid:
-            log_file = info.log_file
-            break
-    if log_file and os.path.exists(log_file):
+    info = processes.get_by_pid(pid)
+    log_file = info.log_file if info is not None else None
+    if log_file:
         try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-                log_lines = lines[-200:]
+            log_lines = await asyncio.to_thread(_cached_tail_lines, log_file, 200)
         except Exception:
+            # Missing or unreadable log file
             log_lines = []
 
     return {"running": alive, "logs": log_lines}
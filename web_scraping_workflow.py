@@ -6,26 +6,222 @@ Automated web scraping with data extraction and CSV export
 import os
 import sys
 import time
+import atexit
+import subprocess
 import logging
 import csv
+import sqlite3
+import itertools
+from contextlib import closing
 from datetime import datetime
+import requests
+
+from modules.jsonutil import json_loads, json_dumps
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+from lxml import etree, html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Browser-side selectors, built once. Row selectors are (By, value) locators
+# for the waits; the values are also passed to the extraction scripts
+_SEL_ATHING = (By.CSS_SELECTOR, ".athing")
+_SEL_PRODUCT_POD = (By.CSS_SELECTOR, "article.product_pod")
+_CSS_NEWS_TITLE = ".titleline > a"
+_CSS_NEWS_SCORE = "span.score"
+_CSS_PRODUCT_TITLE = "h3 a"
+_CSS_PRODUCT_PRICE = ".price_color"
+_CSS_PRODUCT_RATING = "p.star-rating"
+
+# Star-rating class word -> stars (e.g. class="star-rating Three" is 3);
+# mirrored by RATINGS in _PRODUCTS_EXTRACT_JS. Unrated products get 0
+_RATING_MAP = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+
+# In-browser extraction scripts: each page is scraped with one execute_script
+# round-trip instead of a ChromeDriver call per element/attribute.
+# arguments[0] is the maximum number of rows to return, arguments[1] the row
+# selector and the rest the per-field selectors, so the script text is constant.
+# Rows come back as one JSON string of [value, ...] arrays in CSV column
+# order, decoded once in Python
+_NEWS_EXTRACT_JS = """
+return JSON.stringify(Array.from(document.querySelectorAll(arguments[1])).slice(0, arguments[0]).map(a => {
+    const t = a.querySelector(arguments[2]);
+    const s = a.nextElementSibling ? a.nextElementSibling.querySelector(arguments[3]) : null;
+    return [
+        t ? t.innerText.trim() : '',
+        t ? t.href : null,
+        s ? s.innerText.trim() : 'N/A'
+    ];
+}));
+"""
+
+_PRODUCTS_EXTRACT_JS = """
+const RATINGS = {One: 1, Two: 2, Three: 3, Four: 4, Five: 5};
+return JSON.stringify(Array.from(document.querySelectorAll(arguments[1])).slice(0, arguments[0]).map(p => {
+    const t = p.querySelector(arguments[2]);
+    const price = p.querySelector(arguments[3]);
+    const rating = p.querySelector(arguments[4]);
+    return [
+        t ? t.innerText.trim() : '',
+        price ? price.innerText.trim() : '',
+        rating ? (Array.from(rating.classList).map(c => RATINGS[c]).find(Boolean) || 0) : 0
+    ];
+}));
+"""
+
+# Static-HTML extraction (no browser), compiled once. Relative to each row
+# element; class tests use the usual whitespace-padded contains() idiom
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_XP_NEWS_ROWS = etree.XPath(f"//tr[{_has_class('athing')}]")
+_XP_NEWS_TITLE = etree.XPath(f"(.//span[{_has_class('titleline')}]/a)[1]")
+# All score spans at once; each has id="score_<item id>" matching its row's id
+_XP_NEWS_SCORES = etree.XPath(f"//span[{_has_class('score')}][starts-with(@id, 'score_')]")
+
+_XP_PRODUCT_ROWS = etree.XPath(f"//article[{_has_class('product_pod')}]")
+_XP_PRODUCT_TITLE = etree.XPath(".//h3/a")
+_XP_PRODUCT_PRICE = etree.XPath(f".//*[{_has_class('price_color')}]")
+_XP_PRODUCT_RATING = etree.XPath(f".//p[{_has_class('star-rating')}]/@class")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Resolved chromedriver binary, shared by every workflow in this process
+_CHROMEDRIVER_PATH = None
+
+def _chromedriver_path():
+    """Return the chromedriver path, resolving it at most once per process
+    
+    CHROMEDRIVER_PATH in the environment skips webdriver-manager (e.g. in CI).
+    """
+    global _CHROMEDRIVER_PATH
+    if _CHROMEDRIVER_PATH is None:
+        _CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+    return _CHROMEDRIVER_PATH
+
+# Cache lifetime (seconds) for fetched pages and browser-scraped rows
+CACHE_TTL = 3600
+
+class ScrapeCache:
+    """Rows (value lists) extracted by browser scrapes, kept in SQLite for CACHE_TTL seconds"""
+    
+    def __init__(self, path=os.path.join("logs", "scrape_cache.sqlite"), ttl=CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+    
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("CREATE TABLE IF NOT EXISTS scrape_rows (key TEXT PRIMARY KEY, stored_at REAL, rows TEXT)")
+        return conn
+    
+    def get(self, key):
+        """Return the cached rows for key, or None if missing or expired"""
+        with closing(self._connect()) as conn:
+            found = conn.execute("SELECT stored_at, rows FROM scrape_rows WHERE key = ?", (key,)).fetchone()
+        if found is None or time.time() - found[0] > self.ttl:
+            return None
+        return json_loads(found[1])
+    
+    def put(self, key, rows):
+        """Store rows under key"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_rows VALUES (?, ?, ?)", (key, time.time(), json_dumps(rows))
+            )
+
+# CSV columns written by the streaming scrapers; rows are plain tuples in
+# this order rather than dicts
+NEWS_FIELDS = ('title', 'link', 'score', 'scraped_at')
+PRODUCT_FIELDS = ('title', 'price', 'rating', 'scraped_at')
+
+# Targets scraped by execute_web_scraping_workflow by the scrape_pool workers
+SCRAPE_TARGETS = (
+    {'kind': 'news', 'max_items': 15, 'csv_prefix': 'scraped_articles'},
+    {'kind': 'products', 'max_items': 20, 'csv_prefix': 'scraped_products'},
+)
+
+def target_csv(target):
+    """Return (filename, fieldnames) of the timestamped CSV file for a scrape target"""
+    filename = f"{target['csv_prefix']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    fieldnames = NEWS_FIELDS if target['kind'] == 'news' else PRODUCT_FIELDS
+    return filename, fieldnames
+
+def open_csv(filename, fieldnames):
+    """
+    Create a CSV file in the logs directory and write its header row
+    
+    Returns:
+        tuple: (file, csv writer); the caller closes the file
+    """
+    os.makedirs("logs", exist_ok=True)
+    # 1 MiB buffer: small scrapes are written in a single flush
+    csvfile = open(os.path.join("logs", filename), 'w', newline='', encoding='utf-8', buffering=1 << 20)
+    writer = csv.writer(csvfile)
+    writer.writerow(fieldnames)
+    return csvfile, writer
+
 class WebScrapingWorkflow:
-    def __init__(self, headless=False):
-        """Initialize Web Scraping Workflow"""
+    # Only the DOM text is scraped: skip images, stylesheets and notification prompts
+    CHROME_PREFS = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    }
+    
+    WINDOW_SIZE = "1366,768"
+    
+    # Live drivers shared by all workflows in this process, keyed on
+    # (headless, window size); quit at interpreter exit
+    _driver_pool = {}
+    
+    def __init__(self, headless=False, backend=None):
+        """
+        Initialize Web Scraping Workflow
+        
+        Args:
+            headless (bool): Run the browser without a window
+            backend (str): 'selenium' (default) or 'playwright'; defaults to
+                the SCRAPE_BACKEND environment variable
+        """
         self.headless = headless
         self.driver = None
         self.wait = None
         self.logger = self._setup_logging()
         
+        # Optional Playwright backend replacing the Selenium scrapers
+        self.backend = None
+        backend = (backend or os.getenv('SCRAPE_BACKEND', 'selenium')).lower()
+        if backend == 'playwright':
+            from scraping_backend import PlaywrightBackend
+            self.backend = PlaywrightBackend(headless=headless, logger=self.logger)
+        
+        # Keep-alive HTTP session for pages that don't need a browser; with
+        # requests-cache, repeat fetches within CACHE_TTL are served from disk
+        if requests_cache is not None:
+            os.makedirs("logs", exist_ok=True)
+            self.http = requests_cache.CachedSession(
+                cache_name=os.path.join("logs", "http_cache"),
+                backend="sqlite",
+                expire_after=CACHE_TTL,
+                match_headers=["User-Agent"],
+            )
+        else:
+            self.http = requests.Session()
+        self.http.headers["User-Agent"] = USER_AGENT
+        
+        # Extracted rows of browser scrapes, so a cache hit skips Chrome entirely
+        self.scrape_cache = ScrapeCache()
+        
         # Chrome executable paths
         self.chrome_paths = [
             "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
@@ -45,26 +241,68 @@ class WebScrapingWorkflow:
         
         return logger
     
+    @classmethod
+    def get_driver(cls, headless, window_size=WINDOW_SIZE):
+        """Return the pooled driver for these settings if its chromedriver is still running"""
+        key = (headless, window_size)
+        driver = cls._driver_pool.get(key)
+        if driver is None:
+            return None
+        process = driver.service.process
+        if process is not None and process.poll() is None:
+            return driver
+        cls._driver_pool.pop(key, None)
+        return None
+    
+    @classmethod
+    def quit_pooled_drivers(cls):
+        """Quit every pooled driver (registered with atexit)"""
+        while cls._driver_pool:
+            _, driver = cls._driver_pool.popitem()
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
     def setup_webdriver(self):
         """Setup Chrome WebDriver with fallback methods"""
         self.logger.info("Setting up Chrome WebDriver for web scraping...")
         
+        # Reuse a running browser instead of paying Chrome startup again
+        driver = self.get_driver(self.headless)
+        if driver is not None:
+            self.logger.info("Reusing pooled Chrome WebDriver")
+            self.driver = driver
+            self.wait = WebDriverWait(self.driver, 15)
+            return True
+        
         try:
-            # Try webdriver-manager first
+            # webdriver-manager (or CHROMEDRIVER_PATH), resolved once per process
             self.logger.info("Trying webdriver-manager method...")
-            service = Service(ChromeDriverManager().install())
+            # chromedriver output is discarded rather than piped back to us
+            service = Service(_chromedriver_path(), log_output=subprocess.DEVNULL)
             
             options = Options()
+            # Return from driver.get() once the DOM is ready; the scrapers wait
+            # for their own selectors, not for images/fonts/beacons
+            options.page_load_strategy = 'eager'
+            options.add_experimental_option("prefs", self.CHROME_PREFS)
+            options.add_argument("--blink-settings=imagesEnabled=false")
             if self.headless:
-                options.add_argument("--headless")
+                # New headless mode (Chrome 109+); no GPU setup, so no --disable-gpu
+                options.add_argument("--headless=new")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+            options.add_argument(f"--window-size={self.WINDOW_SIZE}")
+            options.add_argument(f"--user-agent={USER_AGENT}")
+            # Only fatal Chrome messages, and no "DevTools listening on ..." banner
+            options.add_argument("--log-level=3")
+            options.add_experimental_option("excludeSwitches", ["enable-logging"])
             
             self.driver = webdriver.Chrome(service=service, options=options)
-            self.wait = WebDriverWait(self.driver, 10)
+            self._driver_pool[(self.headless, self.WINDOW_SIZE)] = self.driver
+            # Generous timeout: scrapers wait for their own selector instead of sleeping
+            self.wait = WebDriverWait(self.driver, 15)
             
             self.logger.info("Chrome WebDriver initialized successfully")
             return True
@@ -73,142 +311,324 @@ class WebScrapingWorkflow:
             self.logger.error(f"WebDriver setup failed: {e}")
             return False
     
+    def _fetch_static(self, url, timeout=15):
+        """Fetch a page over plain HTTP and parse it, or return None on failure"""
+        try:
+            resp = self.http.get(url, timeout=timeout)
+            resp.raise_for_status()
+            tree = lxml_html.fromstring(resp.content, base_url=resp.url)
+            tree.make_links_absolute(resp.url)
+            return tree
+        except Exception as e:
+            self.logger.warning(f"Static fetch failed for {url}: {e}")
+            return None
+    
+    def _iter_with_fallback(self, static_rows, browser_rows, what):
+        """Yield static_rows, or the rows of browser_rows() if there were none"""
+        found = False
+        for row in static_rows:
+            found = True
+            yield row
+        if not found:
+            self.logger.info(f"No {what} in static HTML, falling back to the browser")
+            yield from browser_rows()
+    
+    def _iter_news_static(self, url, max_articles):
+        """Yield articles from the raw HTML (Hacker News needs no JavaScript)"""
+        tree = self._fetch_static(url)
+        if tree is None:
+            return
+        
+        # Item id -> score from one query, instead of a sibling lookup per row
+        scores = {
+            span.get("id")[len("score_"):]: span.text_content().strip()
+            for span in _XP_NEWS_SCORES(tree)
+        }
+        
+        for row in _XP_NEWS_ROWS(tree)[:max_articles]:
+            titles = _XP_NEWS_TITLE(row)
+            yield (
+                titles[0].text_content().strip() if titles else '',
+                titles[0].get("href") if titles else None,
+                scores.get(row.get("id"), "N/A")
+            )
+    
+    def _scrape_browser(self, url, max_items, row_locator, script, field_selectors, what):
+        """
+        Extract rows with Chrome, for when the static fetch gets nothing
+        
+        Results are cached per url/selector/limit, and a cache hit returns
+        without starting or driving the browser.
+        
+        Raises:
+            RuntimeError: Chrome WebDriver could not be started
+        """
+        cache_key = f"{url}|{row_locator[1]}|{max_items}"
+        try:
+            rows = self.scrape_cache.get(cache_key)
+            if rows is not None:
+                self.logger.info(f"Using cached {what} for: {url}")
+                return rows
+        except Exception as e:
+            self.logger.warning(f"Scrape cache unavailable: {e}")
+        
+        # Not [] here: the target failed, it didn't just come back empty
+        if self.driver is None and not self.setup_webdriver():
+            raise RuntimeError(f"Chrome WebDriver could not be started to scrape {what}")
+        
+        self.driver.get(url)
+        
+        # Wait until the rows exist rather than sleeping a fixed time
+        try:
+            self.wait.until(EC.presence_of_all_elements_located(row_locator))
+        except TimeoutException:
+            self.logger.error(f"Timed out waiting for {what} on: {url}")
+            return []
+        
+        # Extract all rows in one execute_script round-trip
+        rows = json_loads(self.driver.execute_script(script, max_items, row_locator[1], *field_selectors))
+        
+        if rows:
+            try:
+                self.scrape_cache.put(cache_key, rows)
+            except Exception as e:
+                self.logger.warning(f"Could not cache scraped {what}: {e}")
+        return rows
+    
+    def _iter_news_articles(self, url="https://news.ycombinator.com", max_articles=10):
+        """
+        Yield news articles as they are scraped
+        
+        Tries a plain HTTP fetch first and only starts Chrome when that fails
+        or finds no articles.
+        """
+        self.logger.info(f"🌐 Scraping news articles from: {url}")
+        started = time.perf_counter()
+        
+        articles = self._iter_with_fallback(
+            self._iter_news_static(url, max_articles),
+            lambda: self._scrape_browser(
+                url, max_articles, _SEL_ATHING, _NEWS_EXTRACT_JS,
+                (_CSS_NEWS_TITLE, _CSS_NEWS_SCORE), "articles"
+            ),
+            "articles"
+        )
+        
+        # One timestamp for the whole scrape; per-row logging only at DEBUG
+        scraped_at = datetime.now().isoformat()
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        count = 0
+        for count, article in enumerate(articles, 1):
+            if debug:
+                self.logger.debug("✅ Scraped article %d: %.50s...", count, article[0])
+            yield (*article, scraped_at)
+        
+        self.logger.info("✅ Scraped %d articles in %.0f ms", count, (time.perf_counter() - started) * 1000)
+    
     def scrape_news_articles(self, url="https://news.ycombinator.com", max_articles=10):
-        """Scrape news articles from a website"""
+        """Scrape news articles from a website as NEWS_FIELDS tuples"""
         try:
-            self.logger.info(f"🌐 Scraping news articles from: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            
-            articles = []
-            
-            # Find article elements (adjust selectors based on target site)
-            article_elements = self.driver.find_elements(By.CSS_SELECTOR, ".athing")
-            
-            for i, article in enumerate(article_elements[:max_articles]):
-                try:
-                    # Extract article data
-                    title_elem = article.find_element(By.CSS_SELECTOR, ".titleline a")
-                    title = title_elem.text.strip()
-                    link = title_elem.get_attribute("href")
-                    
-                    # Get score if available
-                    try:
-                        score_elem = article.find_element(By.XPATH, "following-sibling::tr[1]//span[@class='score']")
-                        score = score_elem.text.strip()
-                    except NoSuchElementException:
-                        score = "N/A"
-                    
-                    articles.append({
-                        'title': title,
-                        'link': link,
-                        'score': score,
-                        'scraped_at': datetime.now().isoformat()
-                    })
-                    
-                    self.logger.info(f"✅ Scraped article {i+1}: {title[:50]}...")
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to scrape article {i+1}: {e}")
-                    continue
-            
-            return articles
+            if self.backend is not None:
+                return self.backend.scrape_news_articles(url, max_articles)
+            return list(self._iter_news_articles(url, max_articles))
             
         except Exception as e:
             self.logger.error(f"Error scraping articles: {e}")
             return []
     
+    def _iter_products_static(self, url, max_products):
+        """Yield products from the raw HTML (books.toscrape.com is fully static)"""
+        tree = self._fetch_static(url)
+        if tree is None:
+            return
+        
+        for card in _XP_PRODUCT_ROWS(tree)[:max_products]:
+            titles = _XP_PRODUCT_TITLE(card)
+            prices = _XP_PRODUCT_PRICE(card)
+            ratings = _XP_PRODUCT_RATING(card)
+            yield (
+                titles[0].text_content().strip() if titles else '',
+                prices[0].text_content().strip() if prices else '',
+                next((_RATING_MAP[word] for word in ratings[0].split() if word in _RATING_MAP), 0) if ratings else 0
+            )
+    
+    def _iter_product_data(self, url="https://books.toscrape.com", max_products=20):
+        """
+        Yield products as they are scraped
+        
+        Tries a plain HTTP fetch first and only starts Chrome when that fails
+        or finds no products.
+        """
+        self.logger.info(f"🛒 Scraping product data from: {url}")
+        started = time.perf_counter()
+        
+        products = self._iter_with_fallback(
+            self._iter_products_static(url, max_products),
+            lambda: self._scrape_browser(
+                url, max_products, _SEL_PRODUCT_POD, _PRODUCTS_EXTRACT_JS,
+                (_CSS_PRODUCT_TITLE, _CSS_PRODUCT_PRICE, _CSS_PRODUCT_RATING), "products"
+            ),
+            "products"
+        )
+        
+        # One timestamp for the whole scrape; per-row logging only at DEBUG
+        scraped_at = datetime.now().isoformat()
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        count = 0
+        for count, product in enumerate(products, 1):
+            if debug:
+                self.logger.debug("✅ Scraped product %d: %.30s...", count, product[0])
+            yield (*product, scraped_at)
+        
+        self.logger.info("✅ Scraped %d products in %.0f ms", count, (time.perf_counter() - started) * 1000)
+    
     def scrape_product_data(self, url="https://books.toscrape.com", max_products=20):
-        """Scrape product data from an e-commerce site"""
+        """Scrape product data from an e-commerce site as PRODUCT_FIELDS tuples"""
         try:
-            self.logger.info(f"🛒 Scraping product data from: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            
-            products = []
-            
-            # Find product elements
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, "article.product_pod")
-            
-            for i, product in enumerate(product_elements[:max_products]):
-                try:
-                    # Extract product data
-                    title_elem = product.find_element(By.CSS_SELECTOR, "h3 a")
-                    title = title_elem.text.strip()
-                    
-                    price_elem = product.find_element(By.CSS_SELECTOR, ".price_color")
-                    price = price_elem.text.strip()
-                    
-                    rating_elem = product.find_element(By.CSS_SELECTOR, "p.star-rating")
-                    rating = rating_elem.get_attribute("class").split()[-1]
-                    
-                    products.append({
-                        'title': title,
-                        'price': price,
-                        'rating': rating,
-                        'scraped_at': datetime.now().isoformat()
-                    })
-                    
-                    self.logger.info(f"✅ Scraped product {i+1}: {title[:30]}...")
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to scrape product {i+1}: {e}")
-                    continue
-            
-            return products
+            if self.backend is not None:
+                return self.backend.scrape_product_data(url, max_products)
+            return list(self._iter_product_data(url, max_products))
             
         except Exception as e:
             self.logger.error(f"Error scraping products: {e}")
             return []
     
-    def save_to_csv(self, data, filename):
-        """Save scraped data to CSV file"""
+    def save_iter_to_csv(self, rows, filename, fieldnames, flush_every=100):
+        """
+        Stream rows into a CSV file as they are produced
+        
+        Args:
+            rows (iterable): Row tuples in fieldnames order, e.g. from _iter_news_articles
+            filename (str): File name inside the logs directory
+            fieldnames (sequence): Column order, also written as the header
+            flush_every (int): Flush every N rows so the file can be read
+                while scraping is still running
+        
+        Returns:
+            int: Number of rows written (no file is created when there are none)
+        """
+        count = 0
         try:
-            if not data:
+            rows = iter(rows)
+            batch = list(itertools.islice(rows, flush_every))
+            if not batch:
                 self.logger.warning("No data to save")
-                return False
-            
-            # Create logs directory if it doesn't exist
-            os.makedirs("logs", exist_ok=True)
-            
-            filepath = os.path.join("logs", filename)
+                return 0
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = data[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                writer.writerows(data)
+            csvfile, writer = open_csv(filename, fieldnames)
+            with csvfile:
+                # A batch of rows per writerows call, flushed after each
+                while batch:
+                    writer.writerows(batch)
+                    count += len(batch)
+                    csvfile.flush()
+                    batch = list(itertools.islice(rows, flush_every))
             
-            self.logger.info(f"✅ Data saved to: {filepath}")
-            return True
+            self.logger.info(f"✅ Data saved to: {csvfile.name}")
+            return count
             
         except Exception as e:
             self.logger.error(f"Error saving CSV: {e}")
-            return False
+            return count
+    
+    def iter_target_rows(self, target):
+        """Yield the rows of one entry of SCRAPE_TARGETS as they are scraped"""
+        if target['kind'] == 'news':
+            self.logger.info("📰 Scraping news articles...")
+            return self._iter_news_articles(max_articles=target['max_items'])
+        self.logger.info("🛒 Scraping product data...")
+        return self._iter_product_data(max_products=target['max_items'])
+    
+    def _scrape_target(self, target):
+        """
+        Scrape one entry of SCRAPE_TARGETS straight into its CSV file
+        
+        Returns:
+            tuple: (rows written, error message or None)
+        """
+        errors = []
+        
+        def rows():
+            # Scraping errors would otherwise end up as CSV errors in save_iter_to_csv
+            try:
+                yield from self.iter_target_rows(target)
+            except Exception as e:
+                self.logger.error(f"Error scraping {target['kind']}: {e}")
+                errors.append(str(e))
+        
+        count = self._save_target_rows(target, rows())
+        return count, errors[0] if errors else None
+    
+    def _save_target_rows(self, target, rows):
+        """Write a target's rows to its timestamped CSV file; returns rows written"""
+        filename, fieldnames = target_csv(target)
+        return self.save_iter_to_csv(rows, filename, fieldnames)
+    
+    def _scrape_targets(self, targets):
+        """
+        Scrape targets in parallel on a scrape_pool of worker processes
+        
+        WebDriver sessions can't be shared between threads, so each worker
+        process owns its own browser; a single writer process owns the CSV
+        files. Falls back to scraping sequentially in this process if the
+        pool can't be used.
+        
+        With the Playwright backend all targets share one browser instead
+        (one context each) and run concurrently on asyncio.
+        
+        Returns:
+            list: (rows written, error message or None) per target, in target order
+        """
+        if self.backend is not None:
+            results = self.backend.scrape_many(targets, return_exceptions=True)
+            return [
+                (0, str(rows)) if isinstance(rows, Exception) else (self._save_target_rows(target, rows), None)
+                for target, rows in zip(targets, results)
+            ]
+        
+        try:
+            from scrape_pool import run_scrape_pool
+            return run_scrape_pool(targets, headless=self.headless, logger=self.logger)
+        except Exception as e:
+            self.logger.warning(f"Parallel scraping failed, falling back to sequential: {e}")
+            return [self._scrape_target(target) for target in targets]
     
-    def execute_web_scraping_workflow(self):
-        """Execute the complete web scraping workflow"""
+    def close_webdriver(self):
+        """Quit this workflow's driver and drop it from the pool"""
+        if not self.driver:
+            return
+        for key, driver in list(self._driver_pool.items()):
+            if driver is self.driver:
+                del self._driver_pool[key]
+        self.driver.quit()
+        self.driver = None
+        self.wait = None
+        self.logger.info("🌐 Browser closed successfully")
+    
+    def execute_web_scraping_workflow(self, close=False):
+        """
+        Execute the complete web scraping workflow
+        
+        Args:
+            close (bool): Quit the browser afterwards instead of keeping it
+                pooled for the next run in this process
+        """
         try:
             self.logger.info("🚀 Starting Web Scraping Workflow...")
             
-            # Setup WebDriver
-            if not self.setup_webdriver():
-                return False
-            
-            # Scrape news articles
-            self.logger.info("📰 Scraping news articles...")
-            articles = self.scrape_news_articles(max_articles=15)
-            
-            if articles:
-                self.save_to_csv(articles, f"scraped_articles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-            
-            # Scrape product data
-            self.logger.info("🛒 Scraping product data...")
-            products = self.scrape_product_data(max_products=20)
+            # Each target streams its rows straight into its own CSV file.
+            # Chrome is started on demand, only if a page can't be scraped statically
+            results = self._scrape_targets(SCRAPE_TARGETS)
+            total = sum(count for count, _ in results)
+            self.logger.info(f"Scraped {total} rows from {len(results)} targets")
             
-            if products:
-                self.save_to_csv(products, f"scraped_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            failed = [target['kind'] for target, (_, error) in zip(SCRAPE_TARGETS, results) if error]
+            if failed:
+                self.logger.error(f"Web scraping failed for: {', '.join(failed)}")
+                return False
+            if total == 0:
+                self.logger.error("Web scraping produced no rows")
+                return False
             
             self.logger.info("✅ Web scraping workflow completed successfully!")
             return True
@@ -218,9 +638,10 @@ class WebScrapingWorkflow:
             return False
         
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("🌐 Browser closed successfully")
+            if close:
+                self.close_webdriver()
+
+atexit.register(WebScrapingWorkflow.quit_pooled_drivers)
 
 def main():
     """Main execution function"""
@@ -243,8 +664,9 @@ def main():
         print("\n🚀 Starting Web Scraping Workflow...")
         print("=" * 50)
         
-        # Create and run automation
-        automation = WebScrapingWorkflow(headless=False)
+        # Create and run automation (headless unless SCRAPE_HEADFUL=1)
+        headful = os.getenv('SCRAPE_HEADFUL', '').lower() in ('1', 'true', 'yes')
+        automation = WebScrapingWorkflow(headless=not headful)
         success = automation.execute_web_scraping_workflow()
         
         if success: